@@ -1,22 +1,23 @@
 from typing import Any
+import hashlib
 import urllib.parse
 from collections import defaultdict
 import json
 
 from django.contrib import admin
+from django.core.cache import caches
 from django.forms import ModelForm
 from django import forms
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.contrib.admin.views.main import ChangeList
 from django.urls import path
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.admin.utils import unquote
 from django.core.exceptions import PermissionDenied
 from django.template.response import TemplateResponse
 from django.contrib.messages import add_message, ERROR
 from django.utils.translation import gettext_lazy as _
-from django.db.models import Q
 from django.http import HttpResponseRedirect
 from django.contrib import messages
 from django.shortcuts import resolve_url
@@ -26,6 +27,7 @@ from django.core.exceptions import ValidationError
 from django.shortcuts import redirect
 from .models import (
     ContentSetting,
+    ContentSettingTag,
     HistoryContentSetting,
     UserTagSetting,
     UserPreview,
@@ -45,10 +47,13 @@ from .settings import (
     ADMIN_CHECKSUM_CHECK_BEFORE_SAVE,
     UI_DOC_URL,
     PREVIEW_ON_SITE_SHOW,
+    ADMIN_PREVIEW_CACHE_TIMEOUT,
+    ADMIN_PREVIEW_CACHE_BACKEND,
 )
-from .caching import get_type_by_name
+from .caching import get_type_by_name, get_form_checksum
+from .types.basic import SimpleString
 from .utils import class_names
-from .export import export_to_format, preview_data, import_to
+from .export import export_to_format, iter_export, preview_data, import_to
 
 
 def user_able_to_update(user, name, user_defined_type=None):
@@ -83,6 +88,73 @@ def html_classes(name):
     )
 
 
+def get_admin_preview_cache_key(cs_type, value, name, user=None):
+    digest = hashlib.md5()
+    for part in (
+        user.pk if user is not None else "",
+        name,
+        cs_type.__class__.__module__,
+        cs_type.__class__.__qualname__,
+        cs_type.version,
+        get_form_checksum(),
+        value,
+    ):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return "CS_ADMIN_PREVIEW_" + digest.hexdigest()
+
+
+def get_full_admin_preview_value(cs_type, value, name, user=None, **params):
+    """
+    the result of `cs_type.get_full_admin_preview_value` cached by the user, the name, the type and its version, the value and the checksum of all values.
+
+    Previews with params (suffixes, actions) and previews of types with `admin_preview_cache=False` are not cached.
+    """
+    if params or not cs_type.admin_preview_cache or ADMIN_PREVIEW_CACHE_TIMEOUT <= 0:
+        return cs_type.get_full_admin_preview_value(value, name, user=user, **params)
+
+    cache = caches[ADMIN_PREVIEW_CACHE_BACKEND]
+    key = get_admin_preview_cache_key(cs_type, value, name, user)
+    full_value = cache.get(key)
+    if full_value is None:
+        full_value = cs_type.get_full_admin_preview_value(value, name, user=user)
+        cache.set(key, full_value, ADMIN_PREVIEW_CACHE_TIMEOUT)
+    return full_value
+
+
+def calc_hidden_names(user):
+    """
+    names of stored settings that the user can not see in the admin (unknown, constant or without view permission).
+
+    The view permission is checked once for each permission function (if `can_view` of the type is not overwritten).
+    """
+    can_view = {}
+    hidden = set()
+    for name in ContentSetting.objects.values_list("name", flat=True):
+        cs_type = get_type_by_name(name)
+        if cs_type is None or cs_type.constant:
+            hidden.add(name)
+            continue
+        if type(cs_type).can_view is not SimpleString.can_view:
+            if not cs_type.can_view(user):
+                hidden.add(name)
+            continue
+        if cs_type.view_permission not in can_view:
+            can_view[cs_type.view_permission] = cs_type.can_view(user)
+        if not can_view[cs_type.view_permission]:
+            hidden.add(name)
+    return frozenset(hidden)
+
+
+def get_hidden_names(request):
+    """
+    the same as `calc_hidden_names` for the user of the request, but calculated once per request.
+    """
+    if not hasattr(request, "_content_settings_hidden_names"):
+        request._content_settings_hidden_names = calc_hidden_names(request.user)
+    return request._content_settings_hidden_names
+
+
 class SettingsChangeList(ChangeList):
     def get_filters_params(self, *args, **kwargs):
         params = super().get_filters_params(*args, **kwargs)
@@ -91,45 +163,22 @@ class SettingsChangeList(ChangeList):
         return params
 
     def get_queryset(self, request, *args, **kwargs):
-        from .conf import get_type_by_name
-
         q = super().get_queryset(request, *args, **kwargs)
-        user = request.user
-
-        tags = get_selected_tags_from_params(self.params)
-        if tags:
 
-            user_settings = list(
-                UserTagSetting.objects.filter(
-                    user=request.user, tag__in=tags
-                ).values_list("name", flat=True)
-            )
-            if user_settings:
-                q = q.filter(name__in=user_settings)
+        for tag in get_selected_tags_from_params(self.params):
+            if tag in USER_TAGS:
+                q = q.filter(
+                    name__in=UserTagSetting.objects.filter(
+                        user=request.user, tag=tag
+                    ).values("name")
+                )
+            else:
+                q = q.filter(name__in=ContentSettingTag.names_with_tag(tag))
 
-            combine = Q()
-            for tag in tags:
-                if tag in USER_TAGS:
-                    continue
-                combine &= Q(tags__iregex=rf"(^|\n){tag}($|\n)")
-
-            q = q.filter(combine)
-        # This is terrible
-        # But I don't know how to do it better
-        # I need to filter out the names user don't have permissions to see
-
-        names = list(q.values_list("name", flat=True))
-        return q.filter(
-            ~Q(
-                name__in=[
-                    name
-                    for name in names
-                    if not get_type_by_name(name)
-                    or get_type_by_name(name).constant
-                    or not get_type_by_name(name).can_view(user)
-                ]
-            )
-        )
+        hidden_names = get_hidden_names(request)
+        if hidden_names:
+            q = q.exclude(name__in=hidden_names)
+        return q
 
 
 class ContentSettingForm(ModelForm):
@@ -193,15 +242,19 @@ class ContentSettingAdmin(admin.ModelAdmin):
     actions = ["export_as_json", "view_as_json"]
 
     def export_as_json(self, request, queryset, download=True):
-        json_data = export_to_format(
-            row for row in queryset if get_type_by_name(row.name).can_view(request.user)
+        def can_view(name):
+            # the name can be stale (the setting was removed from the code)
+            cs_type = get_type_by_name(name)
+            return cs_type is not None and cs_type.can_view(request.user)
+
+        response = StreamingHttpResponse(
+            iter_export(row for row in queryset.iterator() if can_view(row.name)),
+            content_type="application/json",
         )
-        response = HttpResponse(content_type="application/json")
         if download:
             response["Content-Disposition"] = (
                 'attachment; filename="content_settings.json"'
             )
-        response.write(json_data)
         return response
 
     export_as_json.short_description = _("Export selected content settings")
@@ -289,8 +342,6 @@ class ContentSettingAdmin(admin.ModelAdmin):
         }
 
     def context_tags(self, request):
-        from .conf import get_type_by_name
-
         extra_context = {}
         selected_tags = get_selected_tags_from_params(request.GET)
 
@@ -320,19 +371,27 @@ class ContentSettingAdmin(admin.ModelAdmin):
             for tag in sorted(selected_tags)
         ]
 
-        tags_stat = defaultdict(int)
-        user_settings = UserTagSetting.get_user_settings(request.user)
-
-        for cs in self.get_changelist_instance(request).get_queryset(request):
-            cs_type = get_type_by_name(cs.name)
-            if not cs_type or not cs_type.can_view(request.user) or cs_type.constant:
-                continue
-            val_tags = cs.tags_set | user_settings[cs.name]
-            if selected_tags and (not val_tags or selected_tags - val_tags):
-                continue
-
-            for tag in val_tags - selected_tags:
-                tags_stat[tag] += 1
+        # the queryset is already filtered by selected tags and hidden settings
+        names = (
+            self.get_changelist_instance(request)
+            .get_queryset(request)
+            .order_by()
+            .values("name")
+        )
+        # the same tag can be assigned to the name in both tables, so names are counted only once
+        tags_names = defaultdict(set)
+        for tags_qs in (
+            ContentSettingTag.objects.all(),
+            UserTagSetting.objects.filter(user=request.user),
+        ):
+            for tag, name in (
+                tags_qs.filter(name__in=names)
+                .exclude(tag__in=selected_tags)
+                .values_list("tag", "name")
+                .distinct()
+            ):
+                tags_names[tag].add(name)
+        tags_stat = {tag: len(tag_names) for tag, tag_names in tags_names.items()}
 
         extra_context["available_tags"] = [
             {
@@ -536,7 +595,7 @@ class ContentSettingAdmin(admin.ModelAdmin):
         if cs_type is None or cs_type.constant:
             return ""
 
-        full_value = cs_type.get_full_admin_preview_value(obj.value, obj.name)
+        full_value = get_full_admin_preview_value(cs_type, obj.value, obj.name)
         if "error" in full_value:
             return mark_safe(f"<pre style='color: red'>{full_value['error']}</pre>")
         if "html" in full_value:
@@ -1006,12 +1065,19 @@ class ContentSettingAdmin(admin.ModelAdmin):
             if name.startswith("p_")
         }
 
-        with content_settings_context(**other_values):
-            return JsonResponse(
-                cs_type.get_full_admin_preview_value(
-                    value, request.POST["name"], user=request.user, **params
+        if other_values:
+            with content_settings_context(**other_values):
+                return JsonResponse(
+                    cs_type.get_full_admin_preview_value(
+                        value, request.POST["name"], user=request.user, **params
+                    )
                 )
+
+        return JsonResponse(
+            get_full_admin_preview_value(
+                cs_type, value, request.POST["name"], user=request.user, **params
             )
+        )
 
 
 class HistoryContentSettingAdmin(admin.ModelAdmin):
@@ -1064,7 +1130,9 @@ class HistoryContentSettingAdmin(admin.ModelAdmin):
         ids = dict(queryset.order_by("-id").values_list("name", "id"))
         previous_ids = [
             str(csh.previous.id)
-            for csh in HistoryContentSetting.objects.filter(id__in=ids.values())
+            for csh in HistoryContentSetting.prefetch_previous(
+                HistoryContentSetting.objects.filter(id__in=ids.values())
+            )
             if csh.previous
         ]
         return HttpResponseRedirect(
@@ -1076,6 +1144,18 @@ class HistoryContentSettingAdmin(admin.ModelAdmin):
         "Revert selected history records as JSON"
     )
 
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        records = HistoryContentSetting.prefetch_previous(changelist.result_list)
+        ids = dict(
+            ContentSetting.objects.filter(
+                name__in={obj.name for obj in records}
+            ).values_list("name", "id")
+        )
+        for obj in records:
+            obj.content_setting_id = ids.get(obj.name)
+        return changelist
+
     def previous_value(self, obj):
         if obj.previous:
             return obj.previous.value
@@ -1083,12 +1163,16 @@ class HistoryContentSettingAdmin(admin.ModelAdmin):
 
     def name_link(self, obj):
         name = obj.name
-        try:
-            cs = ContentSetting.objects.get(name=name)
-        except ContentSetting.DoesNotExist:
+        if not hasattr(obj, "content_setting_id"):
+            obj.content_setting_id = (
+                ContentSetting.objects.filter(name=name)
+                .values_list("id", flat=True)
+                .first()
+            )
+        if obj.content_setting_id is None:
             return name
         return mark_safe(
-            f'<a href="{reverse("admin:content_settings_contentsetting_change", args=[cs.id])}">{name}</a>'
+            f'<a href="{reverse("admin:content_settings_contentsetting_change", args=[obj.content_setting_id])}">{name}</a>'
         )
 
     def history_actions(self, obj):
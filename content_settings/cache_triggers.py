@@ -34,11 +34,13 @@ class BaseCacheTrigger:
         """
         raise NotImplementedError
 
-    def reset(self):
+    def reset(self, db: Optional[Dict[str, Any]] = None, partial: bool = False):
         """
         reset the trigger state.
 
-        Called during the first run of the system.
+        Called during the first run of the system. `db` is the records that were just loaded from the storage (if any).
+
+        `partial` is True when only a part of the records was loaded (the scope is set), so `db` can not be used for the state of the whole storage.
         """
         raise NotImplementedError
 
@@ -135,12 +137,14 @@ class VersionChecksum(BaseCacheTrigger):
             {k: v.version for k, v in USER_DEFINED_TYPES_INITIAL.items()}
         )
 
-    def set_local_checksum(self, value: Optional[str] = None) -> None:
+    def set_local_checksum(
+        self, value: Optional[str] = None, db: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         calculate and set checksum in the context-local storage
         """
         if value is None:
-            value = self.calc_checksum()
+            value = self.calc_checksum(db)
         DATA.ALL_VALUES_CHECKSUM = value
 
     def get_local_checksum(self) -> str:
@@ -149,13 +153,19 @@ class VersionChecksum(BaseCacheTrigger):
     def get_form_checksum(self):
         return self.get_local_checksum()
 
-    def calc_checksum(self) -> str:
-        from .models import ContentSetting
+    def calc_checksum(self, db: Optional[Dict[str, Any]] = None) -> str:
+        """
+        calculate checksum for all stored records. `db` can be given to avoid loading the records again.
+        """
+        if db is None:
+            from .caching import STORAGE
+
+            db = STORAGE.load_all()
 
         return self.dict_checksum(
             {
                 cs.name: cs.value + (cs.tags or "") + (cs.version or "")
-                for cs in ContentSetting.objects.all()
+                for cs in db.values()
             }
         )
 
@@ -182,12 +192,43 @@ class VersionChecksum(BaseCacheTrigger):
             and self.get_local_checksum() != self.last_checksum_from_cache != ""
         )
 
-    def reset(self):
+    def reset(self, db: Optional[Dict[str, Any]] = None, partial: bool = False):
+        if partial:
+            # the checksum of the whole storage is taken from cache if possible
+            db = None
+            if self.last_checksum_from_cache is None:
+                self.last_checksum_from_cache = self.get_checksum_from_cache()
+
         if self.last_checksum_from_cache is None:
-            self.set_local_checksum()
+            self.set_local_checksum(db=db)
             self.push_checksum()
         else:
             self.set_local_checksum(self.last_checksum_from_cache)
 
     def db_changed(self):
         self.push_checksum(self.calc_checksum())
+
+
+class FrozenTrigger(BaseCacheTrigger):
+    """
+    The trigger for `content_settings.storages.FrozenStorage`. Frozen values are never changed, so there is nothing to check and the cache backend is not used at all.
+
+    The checksum of the frozen artifact is used as a form checksum.
+    """
+
+    def __init__(self, **params) -> None:
+        pass
+
+    def check(self):
+        return False
+
+    def reset(self, db: Optional[Dict[str, Any]] = None, partial: bool = False):
+        from .caching import STORAGE
+
+        DATA.ALL_VALUES_CHECKSUM = STORAGE.revision()
+
+    def get_form_checksum(self):
+        return DATA.ALL_VALUES_CHECKSUM
+
+    def db_changed(self):
+        pass
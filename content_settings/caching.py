@@ -7,10 +7,33 @@ the caching backend is working with context-local storage to store the checksum
 * `ALL_VALUES: Dict[str, Any]` - the python objects of the all settings
 * `ALL_USER_DEFINES: Dict[str, BaseSetting]` - key is the setting name, value is the user defined type (with tags and help text)
 * `POPULATED: bool` - the flag that indicates that all values were populated from the database
+* `LAZY_NAMES: OrderedDict[str, bool]` - only for `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD`, the names of the user defined settings that were loaded on demand in the order of usage. The value is False if the setting was not found in the storage.
+* `READ_NAMES: Optional[Set[str]]` - names of the settings that were read inside of `track_reads`, None if reads are not tracked.
+* `DERIVED_VALUES: Dict[str, Any]` - only for types with `give_memo=True`, the memoized results of `give` (for example rendered templates of `DjangoTemplateNoArgs`)
+* `DERIVED_READS: Dict[str, Set[str]]` - key is the name of the setting in `DERIVED_VALUES`, value is names of the settings that were read to calculate the result
+* `DERIVED_DEPENDENTS: Dict[str, Set[str]]` - the invalidation graph, the opposite of `DERIVED_READS`: key is the name of the setting that was read, value is names of the settings in `DERIVED_VALUES` that should be dropped when the setting is changed
+
+The process can be limited to a subset of settings (see `set_scope`), in that case only the settings from the subset are loaded from the storage.
 """
 
+import hashlib
+import os
+import threading
+
 from asgiref.local import Local
-from typing import Any, Dict, Set, Optional, List
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Set,
+    Optional,
+    List,
+    Iterable,
+    Iterator,
+    Tuple,
+)
 
 from django.conf import settings
 
@@ -19,8 +42,13 @@ from .types import BaseSetting
 from .settings import (
     VALUES_ONLY_FROM_DB,
     CACHE_TRIGGER,
+    STORAGE as STORAGE_SETTING,
     USER_DEFINED_TYPES,
+    USER_DEFINED_LAZY_LOAD,
     PRECACHED_PY_VALUES,
+    SCOPE,
+    VALIDATION_WORKERS,
+    VALIDATE_DEFAULT_VALUE_CACHE_DIR,
 )
 from .context_managers import content_settings_context
 
@@ -29,6 +57,10 @@ TRIGGER = import_object(CACHE_TRIGGER["backend"])(
     **{k: v for k, v in CACHE_TRIGGER.items() if k != "backend"}
 )
 
+STORAGE = import_object(STORAGE_SETTING["backend"])(
+    **{k: v for k, v in STORAGE_SETTING.items() if k != "backend"}
+)
+
 
 class ThreadLocalData(Local):
     def __init__(self, *args, **kwargs) -> None:
@@ -37,11 +69,114 @@ class ThreadLocalData(Local):
         self.ALL_RAW_VALUES: Optional[Dict[str, str]] = None
         self.ALL_VALUES: Optional[Dict[str, Any]] = None
         self.ALL_USER_DEFINES: Optional[Dict[str, BaseSetting]] = None
+        self.LAZY_NAMES: OrderedDict = OrderedDict()
+        self.READ_NAMES: Optional[Set[str]] = None
+        self.DERIVED_VALUES: Optional[Dict[str, Any]] = None
+        self.DERIVED_READS: Optional[Dict[str, Set[str]]] = None
+        self.DERIVED_DEPENDENTS: Optional[Dict[str, Set[str]]] = None
 
 
 DATA = ThreadLocalData(thread_critical=True)
 
 
+class OutOfScopeError(AttributeError):
+    """
+    exception that is raised when the setting is not in the scope of the current process
+    """
+
+    pass
+
+
+SCOPE_PARAMS: Optional[Dict[str, Tuple[str, ...]]] = None
+SCOPE_NAMES: Optional[Set[str]] = None
+
+
+def set_scope(
+    apps: Iterable[str] = (),
+    tags: Iterable[str] = (),
+    prefixes: Iterable[str] = (),
+    names: Iterable[str] = (),
+) -> None:
+    """
+    limit the current process to a subset of settings. A setting is in the scope if it matches at least one of the conditions:
+
+    * `apps` - the setting is defined in one of the apps
+    * `tags` - the setting has one of the tags
+    * `prefixes` - the name of the setting starts with one of the prefixes
+    * `names` - the name of the setting is in the list
+
+    User defined settings can be in the scope only by `prefixes` or `names`.
+
+    Only settings from the scope are loaded from the storage. Accessing a setting outside of the scope raises `OutOfScopeError`.
+
+    Should be called before the first access of settings, for example in the worker init. The same can be set with `CONTENT_SETTINGS_SCOPE` django setting.
+    """
+    global SCOPE_PARAMS, SCOPE_NAMES
+
+    SCOPE_PARAMS = {
+        "apps": tuple(apps),
+        "tags": tuple(tags),
+        "prefixes": tuple(prefixes),
+        "names": tuple(names),
+    }
+    SCOPE_NAMES = None
+    set_populated(False)
+
+
+def reset_scope() -> None:
+    """
+    remove the scope, so all settings are loaded again.
+    """
+    global SCOPE_PARAMS, SCOPE_NAMES
+
+    SCOPE_PARAMS = None
+    SCOPE_NAMES = None
+    set_populated(False)
+
+
+def get_scope_names() -> Optional[Set[str]]:
+    """
+    returns names of the code settings in the scope or None if the scope is not set.
+    """
+    global SCOPE_NAMES
+
+    if SCOPE_PARAMS is None:
+        return None
+
+    if SCOPE_NAMES is not None:
+        return SCOPE_NAMES
+
+    from .conf import ALL
+    from .store import cs_has_app, get_app_name
+
+    names = set(SCOPE_PARAMS["names"])
+    for name, cs_type in ALL.items():
+        if (
+            name.startswith(SCOPE_PARAMS["prefixes"])
+            or cs_has_app(name)
+            and get_app_name(name) in SCOPE_PARAMS["apps"]
+            or cs_type.get_tags() & set(SCOPE_PARAMS["tags"])
+        ):
+            names.add(name)
+
+    SCOPE_NAMES = names
+    return SCOPE_NAMES
+
+
+def is_in_scope(name: str) -> bool:
+    """
+    check if the setting (code or user defined) is in the scope of the current process.
+    """
+    if SCOPE_PARAMS is None:
+        return True
+
+    return name in get_scope_names() or name.startswith(SCOPE_PARAMS["prefixes"])
+
+
+if SCOPE is not None:
+    set_scope(**SCOPE)
+
+
 def get_form_checksum():
     if not is_populated():
         populate()
@@ -65,6 +200,7 @@ def set_new_type(
     if not is_populated():
         populate()
 
+    touch_lazy_name(name)
     prev_cs_type = cs_type = DATA.ALL_USER_DEFINES.get(name)
 
     if not cs_type or cs_type.tags != tags_set or cs_type.help != help:
@@ -74,6 +210,13 @@ def set_new_type(
         )
 
     DATA.ALL_USER_DEFINES[name] = cs_type
+    if prev_cs_type is not cs_type:
+        invalidate_derived([name])
+    if USER_DEFINED_LAZY_LOAD:
+        # the setting can be created in the process after it was marked as missing
+        DATA.LAZY_NAMES[name] = True
+        DATA.LAZY_NAMES.move_to_end(name)
+        evict_lazy_names()
     return prev_cs_type
 
 
@@ -86,6 +229,8 @@ def replace_user_type(name: str, cs_type: BaseSetting) -> Optional[BaseSetting]:
 
     prev_cs_type = DATA.ALL_USER_DEFINES.get(name)
     DATA.ALL_USER_DEFINES[name] = cs_type
+    if prev_cs_type is not cs_type:
+        invalidate_derived([name])
     return prev_cs_type
 
 
@@ -100,32 +245,55 @@ def set_new_value(name: str, new_value: str, version: Optional[str] = None) -> s
     cs_type = get_type_by_name(name)
     assert cs_type is not None, f"Can't find type for {name}"
 
-    prev_value = get_raw_value(name)
+    # reading of the previous value is not tracked by `track_reads`
+    # a value can be set for a setting outside of the scope (for example, by `content_settings_context`)
+    read_names = getattr(DATA, "READ_NAMES", None)
+    DATA.READ_NAMES = None
+    try:
+        prev_value = get_raw_value(name, check_scope=False)
+    finally:
+        DATA.READ_NAMES = read_names
 
     if version is None or cs_type.version == version and prev_value != new_value:
         DATA.ALL_RAW_VALUES[name] = new_value
         if PRECACHED_PY_VALUES:
-            DATA.ALL_VALUES[name] = cs_type.to_python(new_value)
+            DATA.ALL_VALUES[name] = cs_type.memo_to_python(new_value)
         elif name in DATA.ALL_VALUES:
             DATA.ALL_VALUES.pop(name)
+        if prev_value != new_value:
+            invalidate_derived([name])
 
     return prev_value
 
 
+def set_py_value(name: str, py_value: Any) -> None:
+    """
+    saves the python object that was already converted from the current raw value of the setting to the context-local storage.
+    """
+    DATA.ALL_VALUES[name] = py_value
+
+
+def get_converted_py_values(names: Iterable[str]) -> Dict[str, Any]:
+    """
+    python objects of the given settings that are already converted in the context-local storage.
+    """
+    return {name: DATA.ALL_VALUES[name] for name in names if name in DATA.ALL_VALUES}
+
+
 def delete_value(name: str) -> Optional[str]:
     """
     delete the value from the context-local storage
     """
     if name in DATA.ALL_VALUES:
         del DATA.ALL_VALUES[name]
+    invalidate_derived([name])
     return DATA.ALL_RAW_VALUES.pop(name, None)
 
 
 def set_new_db_value(name: str, value: str, *type_define) -> str:
     """
-    set the new value for the setting in DB
+    set the new value for the setting in the storage (DB by default)
     """
-    from .models import ContentSetting
     from .conf import get_str_tags
 
     if type_define:
@@ -141,22 +309,26 @@ def set_new_db_value(name: str, value: str, *type_define) -> str:
 
     cs_type.validate_value(value)
 
-    try:
-        cs = ContentSetting.objects.get(name=name)
-    except ContentSetting.DoesNotExist:
-        ContentSetting.objects.create(
-            name=name,
-            value=value,
-            version=cs_type.version,
-            tags=get_str_tags(name, cs_type, value),
-            help=cs_type.get_help(),
-            user_defined_type=cs_type.user_defined_slug,
+    cs = STORAGE.load([name]).get(name)
+    if cs is None:
+        STORAGE.save_many(
+            {
+                name: {
+                    "value": value,
+                    "version": cs_type.version,
+                    "tags": get_str_tags(name, cs_type, value),
+                    "help": cs_type.get_help(),
+                    "user_defined_type": cs_type.user_defined_slug,
+                }
+            }
         )
     else:
         assert cs.version == cs_type.version, "Version mismatch"
 
-        cs.value = value
-        cs.save()
+        fields = {"value": value}
+        if not cs.user_defined_type:
+            fields["tags"] = get_str_tags(name, cs_type, value)
+        STORAGE.save_many({name: fields})
 
     return set_new_value(name, value, version=None)
 
@@ -165,14 +337,19 @@ def delete_user_value(name: str) -> Optional[str]:
     """
     delete user defined setting from the context-local storage and returns its raw value
     """
-    if get_raw_value(name) is None:
+    if not is_populated():
+        populate()
+
+    DATA.LAZY_NAMES.pop(name, None)
+    prev_value = DATA.ALL_RAW_VALUES.get(name)
+    if prev_value is None:
         return None
 
-    prev_value = get_raw_value(name)
     del DATA.ALL_RAW_VALUES[name]
     if name in DATA.ALL_VALUES:
         del DATA.ALL_VALUES[name]
     del DATA.ALL_USER_DEFINES[name]
+    invalidate_derived([name])
 
     return prev_value
 
@@ -199,9 +376,133 @@ def get_userdefined_type_by_name(name: str) -> Optional[BaseSetting]:
     if not is_populated():
         populate()
 
+    touch_lazy_name(name)
     return DATA.ALL_USER_DEFINES.get(name)
 
 
+def load_user_defined(names: Iterable[str]) -> None:
+    """
+    only for `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD`. Load user defined settings by names from the storage with a single request.
+
+    Names that are already loaded (or known to be missing) are skipped. The least recently used settings are removed from the context-local storage if there are more than `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD` of them.
+    """
+    from .conf import ALL, USER_DEFINED_TYPES_INSTANCE
+
+    if not is_populated():
+        populate()
+
+    names = [
+        name
+        for name in names
+        if name not in ALL and name not in DATA.LAZY_NAMES and is_in_scope(name)
+    ]
+    if not names:
+        return
+
+    db = STORAGE.load(names)
+    for name in names:
+        cs = db.get(name)
+        DATA.LAZY_NAMES[name] = bool(
+            cs is not None
+            and cs.user_defined_type
+            and cs.user_defined_type in USER_DEFINED_TYPES_INSTANCE
+        )
+
+    for name in names:
+        if not DATA.LAZY_NAMES[name]:
+            continue
+        cs = db[name]
+        set_new_type(name, cs.user_defined_type, cs.tags_set, cs.help)
+        set_new_value(
+            name,
+            cs.value,
+            version=(None if settings.DEBUG else cs.version),
+        )
+
+    evict_lazy_names()
+
+
+def evict_lazy_names() -> None:
+    """
+    only for `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD`. Remove the least recently used user defined settings from the context-local storage if there are more than `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD` of them.
+    """
+    while len(DATA.LAZY_NAMES) > USER_DEFINED_LAZY_LOAD:
+        name, loaded = DATA.LAZY_NAMES.popitem(last=False)
+        if loaded:
+            delete_user_value(name)
+
+
+def touch_lazy_name(name: str) -> None:
+    """
+    only for `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD`. Load the user defined setting if it is not loaded yet and mark it as recently used.
+    """
+    if not USER_DEFINED_LAZY_LOAD:
+        return
+
+    if name in DATA.LAZY_NAMES:
+        DATA.LAZY_NAMES.move_to_end(name)
+    else:
+        load_user_defined([name])
+
+
+@contextmanager
+def track_reads() -> Iterator[Set[str]]:
+    """
+    context manager that collects names of all settings that were read inside of it (with `get_py_value` or `get_raw_value`).
+
+    Can be nested, the outer one collects names of the inner one as well.
+    """
+    prev_names = getattr(DATA, "READ_NAMES", None)
+    DATA.READ_NAMES = names = set()
+    try:
+        yield names
+    finally:
+        DATA.READ_NAMES = prev_names
+        if prev_names is not None:
+            prev_names.update(names)
+
+
+def invalidate_derived(names: Iterable[str]) -> None:
+    """
+    drop memoized results of `give` (`DATA.DERIVED_VALUES`) for the settings that read (directly or transitively) any of the given settings, and for the given settings themselves.
+    """
+    if not getattr(DATA, "DERIVED_DEPENDENTS", None):
+        return
+
+    to_drop = list(names)
+    while to_drop:
+        for name in DATA.DERIVED_DEPENDENTS.pop(to_drop.pop(), ()):
+            if name in DATA.DERIVED_READS:
+                del DATA.DERIVED_READS[name]
+                del DATA.DERIVED_VALUES[name]
+                to_drop.append(name)
+
+
+def get_derived_value(name: str, cs_type: BaseSetting) -> Any:
+    """
+    get the result of `give` (without suffix) for the type with `give_memo=True`. The result is memoized in the context-local storage together with names of the settings that were read to calculate it.
+    """
+    if not is_populated():
+        populate()
+
+    if name not in DATA.DERIVED_READS:
+        with track_reads() as read_names:
+            value = cs_type.give(get_py_value(name))
+        read_names.add(name)
+        DATA.DERIVED_VALUES[name] = value
+        DATA.DERIVED_READS[name] = read_names
+        for read_name in read_names:
+            DATA.DERIVED_DEPENDENTS.setdefault(read_name, set()).add(name)
+        return value
+
+    # the outer tracking should know about dependencies of the memoized value
+    outer_read_names = getattr(DATA, "READ_NAMES", None)
+    if outer_read_names is not None:
+        outer_read_names.update(DATA.DERIVED_READS[name])
+
+    return DATA.DERIVED_VALUES[name]
+
+
 def get_value(name: str, suffix: Optional[str] = None) -> Any:
     """
     get the value of the setting by its name and optional suffix
@@ -211,21 +512,36 @@ def get_value(name: str, suffix: Optional[str] = None) -> Any:
     if cs_type is None:
         raise AttributeError(f"{name} is not defined in any content_settings.py file")
 
+    if suffix is None and cs_type.give_memo:
+        return get_derived_value(name, cs_type)
+
     return cs_type.give(get_py_value(name), suffix)
 
 
-def get_raw_value(name: str) -> Optional[str]:
+def get_raw_value(name: str, check_scope: bool = True) -> Optional[str]:
     """
     get the raw value of the setting by its name
+
+    if `check_scope` is True, `OutOfScopeError` is raised for a setting outside of the scope that has no value
     """
     from .conf import is_constant
 
+    read_names = getattr(DATA, "READ_NAMES", None)
+    if read_names is not None:
+        read_names.add(name)
+
     if is_constant(name):
         return get_type_by_name(name).default
 
     if not is_populated():
         populate()
 
+    touch_lazy_name(name)
+    if check_scope and name not in DATA.ALL_RAW_VALUES and not is_in_scope(name):
+        raise OutOfScopeError(
+            f"{name} is not in the scope of the current process (CONTENT_SETTINGS_SCOPE)"
+        )
+
     return DATA.ALL_RAW_VALUES.get(name)
 
 
@@ -234,14 +550,15 @@ def get_constant_py_value(name: str) -> Any:
     get the python object of the constant setting by its name
     """
     # constant can work without populated data
-    if DATA.ALL_VALUES and name in DATA.ALL_VALUES:
-        return DATA.ALL_VALUES[name]
+    all_values = getattr(DATA, "ALL_VALUES", None)
+    if all_values and name in all_values:
+        return all_values[name]
 
     cs_type = get_type_by_name(name)
 
-    if DATA.ALL_VALUES is None:
+    if all_values is None:
         DATA.ALL_VALUES = {}
-    DATA.ALL_VALUES[name] = cs_type.to_python(cs_type.default)
+    DATA.ALL_VALUES[name] = cs_type.memo_to_python(cs_type.default)
 
     return DATA.ALL_VALUES[name]
 
@@ -252,20 +569,30 @@ def get_py_value(name: str) -> Any:
     """
     from .conf import is_constant
 
+    read_names = getattr(DATA, "READ_NAMES", None)
+    if read_names is not None:
+        read_names.add(name)
+
     if is_constant(name):
         return get_constant_py_value(name)
 
     if not is_populated():
         populate()
 
+    touch_lazy_name(name)
     if name in DATA.ALL_VALUES:
         return DATA.ALL_VALUES[name]
 
+    if name not in DATA.ALL_RAW_VALUES and not is_in_scope(name):
+        raise OutOfScopeError(
+            f"{name} is not in the scope of the current process (CONTENT_SETTINGS_SCOPE)"
+        )
+
     assert name in DATA.ALL_RAW_VALUES, f"{name} is unknown"
 
     cs_type = get_type_by_name(name)
 
-    DATA.ALL_VALUES[name] = cs_type.to_python(get_raw_value(name))
+    DATA.ALL_VALUES[name] = cs_type.memo_to_python(get_raw_value(name))
 
     return DATA.ALL_VALUES[name]
 
@@ -280,19 +607,35 @@ def is_populated() -> bool:
 def set_populated(value: bool = True) -> None:
     DATA.POPULATED = value
 
-    if value and DATA.ALL_RAW_VALUES is None:
+    # attributes of the context-local storage are not created for new threads
+    if value and getattr(DATA, "ALL_RAW_VALUES", None) is None:
         DATA.ALL_VALUES = {}
         DATA.ALL_RAW_VALUES = {}
         DATA.ALL_USER_DEFINES = {}
+        DATA.LAZY_NAMES = OrderedDict()
+        DATA.DERIVED_VALUES = {}
+        DATA.DERIVED_READS = {}
+        DATA.DERIVED_DEPENDENTS = {}
 
 
 def get_db_objects() -> Dict[str, Any]:
     """
-    get the database objects for the settings
+    get the stored records for the settings (the database objects for the default storage)
+
+    if the scope is set, only records from the scope are loaded
+
+    if `CONTENT_SETTINGS_USER_DEFINED_LAZY_LOAD` is set, only records of code settings are loaded
     """
-    from .models import ContentSetting
+    scope_names = get_scope_names()
+    if USER_DEFINED_LAZY_LOAD:
+        from .conf import ALL
+
+        return STORAGE.load(ALL.keys() if scope_names is None else scope_names)
 
-    return {v.name: v for v in ContentSetting.objects.all()}
+    if scope_names is None:
+        return STORAGE.load_all()
+
+    return STORAGE.load(scope_names, prefixes=SCOPE_PARAMS["prefixes"])
 
 
 def get_all_names() -> List[str]:
@@ -314,16 +657,61 @@ def populate() -> None:
 
     set_populated(True)
 
-    # test DB access
-    try:
-        from .models import ContentSetting
-
-        ContentSetting.objects.all().first()
-    except Exception:
+    if not STORAGE.is_available():
         return
 
-    reset_values()
-    TRIGGER.reset()
+    db = get_db_objects()
+    DATA.LAZY_NAMES = OrderedDict()
+    reset_values(db)
+    TRIGGER.reset(db, partial=SCOPE_PARAMS is not None or bool(USER_DEFINED_LAZY_LOAD))
+
+
+def map_in_context(
+    func: Callable[[Any], Any],
+    items: List[Any],
+    context: Optional[Dict[str, Any]] = None,
+    skip_populate: bool = False,
+) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    call `func` for each of `items` and return a list of pairs (result, exception) in the same order as `items`.
+
+    If `CONTENT_SETTINGS_VALIDATION_WORKERS` is more than 1, items are split between threads of the pool. Each thread has its own context-local storage, so it enters `content_settings_context` with `context` (and does not load values from the storage if `skip_populate` is True). Otherwise items are processed in the current thread, that should already be in the context.
+    """
+
+    def call(item):
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+    workers = min(VALIDATION_WORKERS or 0, len(items))
+    if workers <= 1:
+        return [call(item) for item in items]
+
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connections
+    from django.utils import translation
+
+    language = translation.get_language()
+
+    def call_chunk(indexes):
+        if skip_populate:
+            set_populated(True)
+        try:
+            with translation.override(language), content_settings_context(
+                **(context or {})
+            ):
+                return [call(items[index]) for index in indexes]
+        finally:
+            connections.close_all()
+
+    chunks = [list(range(i, len(items), workers)) for i in range(workers)]
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for indexes, chunk_results in zip(chunks, executor.map(call_chunk, chunks)):
+            for index, result in zip(indexes, chunk_results):
+                results[index] = result
+    return results
 
 
 def validate_default_values():
@@ -335,20 +723,97 @@ def validate_default_values():
     populated = is_populated()
     set_populated(True)
 
+    context = {name: cs_type.default for name, cs_type in ALL.items()}
+    names = [name for name, cs_type in ALL.items() if isinstance(cs_type.default, str)]
+
     try:
-        with content_settings_context(
-            **{name: cs_type.default for name, cs_type in ALL.items()}
-        ):
-            for name, cs_type in ALL.items():
-                if not isinstance(cs_type.default, str):
-                    continue
-                try:
-                    cs_type.validate_value(cs_type.default)
-                except Exception as e:
-                    raise AssertionError(f"Error validating {name}: {e}")
+        with content_settings_context(**context):
+            results = map_in_context(
+                lambda name: ALL[name].validate_value(ALL[name].default),
+                names,
+                context=context,
+                skip_populate=True,
+            )
     finally:
         set_populated(populated)
 
+    for name, (_, error) in zip(names, results):
+        if error is not None:
+            raise AssertionError(f"Error validating {name}: {error}")
+
+
+DEFAULT_VALUES_VALIDATED: Optional[str] = None
+DEFAULT_VALUES_LOCK = threading.Lock()
+
+
+def get_default_values_digest() -> str:
+    """
+    digest of types, versions and default values of all registered settings. The result of `validate_default_values` can be reused while the digest is the same.
+    """
+    from . import __version__
+    from .conf import ALL
+
+    digest = hashlib.md5(__version__.encode("utf-8"))
+    for name in sorted(ALL.keys()):
+        cs_type = ALL[name]
+        digest.update(
+            repr(
+                (
+                    name,
+                    cs_type.__class__.__module__,
+                    cs_type.__class__.__qualname__,
+                    cs_type.version,
+                    cs_type.default,
+                )
+            ).encode("utf-8")
+        )
+    return digest.hexdigest()
+
+
+def get_default_values_cache_path(digest: str) -> Optional[str]:
+    """
+    path of the file that marks default values with the given digest as validated, None if `CONTENT_SETTINGS_VALIDATE_DEFAULT_VALUE_CACHE_DIR` is not set.
+    """
+    if not VALIDATE_DEFAULT_VALUE_CACHE_DIR:
+        return None
+    return os.path.join(
+        VALIDATE_DEFAULT_VALUE_CACHE_DIR, f"content_settings_defaults_{digest}.ok"
+    )
+
+
+def validate_default_values_once() -> bool:
+    """
+    validate default values only once per process (and only once per digest of defaults if `CONTENT_SETTINGS_VALIDATE_DEFAULT_VALUE_CACHE_DIR` is set).
+
+    Returns True if the values were validated by the call.
+    """
+    global DEFAULT_VALUES_VALIDATED
+
+    digest = get_default_values_digest()
+    if DEFAULT_VALUES_VALIDATED == digest:
+        return False
+
+    with DEFAULT_VALUES_LOCK:
+        if DEFAULT_VALUES_VALIDATED == digest:
+            return False
+
+        path = get_default_values_cache_path(digest)
+        if path is not None and os.path.exists(path):
+            DEFAULT_VALUES_VALIDATED = digest
+            return False
+
+        validate_default_values()
+        DEFAULT_VALUES_VALIDATED = digest
+
+        if path is not None:
+            try:
+                os.makedirs(VALIDATE_DEFAULT_VALUE_CACHE_DIR, exist_ok=True)
+                with open(path, "w"):
+                    pass
+            except OSError:
+                pass
+        return True
+
 
 def reset_user_values(db: Optional[Dict[str, Any]] = None) -> None:
     """
@@ -399,8 +864,12 @@ def reset_values(db: Optional[Dict[str, Any]] = None) -> None:
 
     # the first run (not raw values)
     is_init = not bool(DATA.ALL_RAW_VALUES)
+    scope_names = get_scope_names()
 
     for name, cs_type in ALL.items():
+        if scope_names is not None and name not in scope_names:
+            continue
+
         if cs_type.constant:
             set_new_value(name, ALL[name].default)
 
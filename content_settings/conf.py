@@ -9,6 +9,7 @@ It has the following global variables:
 * `ALL: Dict[str, BaseSetting]` - the all registereg settings types
 * `CALL_TAGS: Optional[List[Callable]]` - the list of function that is taken from `CONTENT_SETTINGS_TAGS` setting and used to generate tags for settings.
 * `CONSTANTS: Set[str]` - a set of names of content settings that are constants. Those are not stored in DB.
+* `CHAIN_DEPENDENCIES: Dict[str, Dict[str, Optional[str]]]` - key is the name of the setting that was successfully validated by `validate_all_with_context`, value is raw values of all settings that were read during the validation (including the setting itself).
 """
 
 from importlib import import_module
@@ -23,6 +24,8 @@ from .types.basic import BaseSetting
 from .caching import (
     get_value,
     get_py_value,
+    get_raw_value,
+    track_reads,
     get_type_by_name,
     get_all_names,
     get_form_checksum,
@@ -45,6 +48,7 @@ USER_DEFINED_TYPES_NAME: Dict[str, str] = {}
 ALL: Dict[str, BaseSetting] = {}
 CALL_TAGS: Optional[List[Callable]] = None
 CONSTANTS: Set[str] = set()
+CHAIN_DEPENDENCIES: Dict[str, Dict[str, Optional[str]]] = {}
 
 
 def is_constant(name: str) -> bool:
@@ -176,24 +180,85 @@ def split_attr(value: str) -> Tuple[Optional[str], str, Optional[str]]:
     return prefix, name, suffix
 
 
+def get_chain_dependents(names: Set[str]) -> Set[str]:
+    """
+    returns names of the settings that read (directly or transitively) any of the given settings during the last validation.
+    """
+    dependents = {}
+    for name, reads in CHAIN_DEPENDENCIES.items():
+        for read_name in reads:
+            if read_name != name:
+                dependents.setdefault(read_name, set()).add(name)
+
+    result = set()
+    to_check = list(names)
+    while to_check:
+        for name in dependents.get(to_check.pop(), ()):
+            if name not in result:
+                result.add(name)
+                to_check.append(name)
+    return result
+
+
+def is_chain_validated(name: str) -> bool:
+    """
+    check if the setting was validated with the same raw values of itself and of all settings it read during the validation. Should be called inside of the context with new values.
+    """
+    if name not in CHAIN_DEPENDENCIES:
+        return False
+
+    return all(
+        get_raw_value(read_name) == raw_value
+        for read_name, raw_value in CHAIN_DEPENDENCIES[name].items()
+    )
+
+
 def validate_all_with_context(context: Dict[str, Any]):
     """
     validate all settings with the given context to make sure all of them are valid.
 
+    Names that are read during the validation of each setting are recorded in `CHAIN_DEPENDENCIES`, so the next time only settings that are changed in the context and their dependents are validated. All settings are validated if the context defines new user defined types.
+
     Do not perform if `CONTENT_SETTINGS_CHAIN_VALIDATE = False`
     """
     if not CHAIN_VALIDATE:
         return
 
+    from .caching import is_in_scope, map_in_context
+
+    full = any(isinstance(value, tuple) for value in context.values())
+
+    def validate(name):
+        cs_type = ALL[name]
+        if name in context:
+            cs_type.validate_raw_value(context[name])
+            return
+
+        CHAIN_DEPENDENCIES.pop(name, None)
+        with track_reads() as read_names:
+            cs_type.validate(get_py_value(name))
+        CHAIN_DEPENDENCIES[name] = {
+            read_name: get_raw_value(read_name) for read_name in read_names | {name}
+        }
+
     with content_settings_context(**context):
-        for name, cs_type in ALL.items():
-            try:
-                if name in context:
-                    cs_type.validate_raw_value(context[name])
-                else:
-                    cs_type.validate(get_py_value(name))
-            except Exception as e:
-                raise ValidationError(f"Error validating {name}: {e}")
+        names = [
+            name
+            for name in ALL.keys()
+            if is_in_scope(name) and name not in context
+            if full or not is_chain_validated(name)
+        ]
+        names_to_check = set(names) | get_chain_dependents(set(names) | set(context))
+        names = [
+            name
+            for name in ALL.keys()
+            if is_in_scope(name) and (name in context or name in names_to_check)
+        ]
+        results = map_in_context(validate, names, context=context)
+
+    for name, (_, error) in zip(names, results):
+        if error is not None:
+            raise ValidationError(f"Error validating {name}: {error}")
 
 
 def get_str_tags(
@@ -214,43 +279,49 @@ def get_str_tags(
 
 def set_initial_values_for_db(apply: bool = False) -> List[Tuple[str, str]]:
     """
-    sync settings with DB.
+    sync settings with the storage (DB by default).
         * creates settings that are not in DB
         * updates settings that are in DB but have different attributes such as help text or tags
         * deletes settings that are in DB but are not in ALL
 
     attribute `apply` is used to apply changes in DB immediately. Can be used in tests.
+
+    The diff is calculated from a single `load_all` of the storage and all of the changes are saved with a single `save_many`.
     """
-    from content_settings.models import ContentSetting, HistoryContentSetting
+    from .caching import STORAGE
+    from .storages import StoredSetting, RECORD_FIELDS
 
     changes = []
+    records = {}
+    db = STORAGE.load_all()
 
-    def execute(name, key, func):
+    def execute(name, key, fields):
         changes.append((name, key))
-        if apply:
-            func()
-            HistoryContentSetting.update_last_record_for_name(name)
-
-    def execute_update_obj(name, cs, show="update", **kwargs):
-        def _up():
-            for k, v in kwargs.items():
-                setattr(cs, k, v)
-            cs.save()
+        if fields is None or records.get(name, {}) is None:
+            records[name] = fields
+        else:
+            records[name] = {**records.get(name, {}), **fields}
 
-        execute(name, show, _up)
+    def execute_update_obj(cs, show="update", **kwargs):
+        execute(cs.name, show, kwargs)
+        cs = StoredSetting(
+            cs.name,
+            **{key: kwargs.get(key, getattr(cs, key)) for key in RECORD_FIELDS},
+        )
+        # the same as the pre_save receiver does for the saved setting
+        if not cs.user_defined_type and cs.name in ALL:
+            cs.tags = get_str_tags(cs.name, ALL[cs.name], cs.value)
+        return cs
 
     for k, cs_type in ALL.items():
         if cs_type.constant:
             continue
 
-        try:
-            ContentSetting.objects.get(name=k)
-        except ContentSetting.DoesNotExist:
+        if k not in db:
             execute(
                 k,
                 "create",
-                lambda: ContentSetting.objects.create(
-                    name=k,
+                dict(
                     value=cs_type.default,
                     version=cs_type.version,
                     tags=get_str_tags(k, cs_type),
@@ -258,11 +329,11 @@ def set_initial_values_for_db(apply: bool = False) -> List[Tuple[str, str]]:
                 ),
             )
 
-    for cs in ContentSetting.objects.all():
+    for cs in db.values():
         if cs.name in ALL:
             cs_type = ALL[cs.name]
             if cs_type.constant:
-                execute(cs.name, "delete", lambda: cs.delete())
+                execute(cs.name, "delete", None)
                 continue
 
             assert (
@@ -270,17 +341,16 @@ def set_initial_values_for_db(apply: bool = False) -> List[Tuple[str, str]]:
             ), f"{cs.name} is not a code setting and not overwrite_user_defined"
 
             if cs.version != cs_type.version:
-                execute_update_obj(
-                    cs.name,
+                cs = execute_update_obj(
                     cs,
                     value=cs_type.default,
                     version=cs_type.version,
+                    tags=get_str_tags(cs.name, cs_type),
                     user_defined_type=None,
                 )
 
             if cs.user_defined_type:
-                execute_update_obj(
-                    cs.name,
+                cs = execute_update_obj(
                     cs,
                     user_defined_type=None,
                     show="adjust",
@@ -290,8 +360,7 @@ def set_initial_values_for_db(apply: bool = False) -> List[Tuple[str, str]]:
             str_help = cs_type.get_help()
 
             if cs.tags != str_tags or cs.help != str_help:
-                execute_update_obj(
-                    cs.name,
+                cs = execute_update_obj(
                     cs,
                     tags=str_tags,
                     help=str_help,
@@ -301,17 +370,20 @@ def set_initial_values_for_db(apply: bool = False) -> List[Tuple[str, str]]:
         else:
             if cs.user_defined_type:
                 if cs.user_defined_type not in USER_DEFINED_TYPES_INSTANCE:
-                    execute(cs.name, "delete", lambda: cs.delete())
+                    execute(cs.name, "delete", None)
                 elif (
                     cs.version
                     != USER_DEFINED_TYPES_INITIAL[cs.user_defined_type].version
                 ):
                     cs_type = USER_DEFINED_TYPES_INSTANCE[cs.user_defined_type]()
                     execute_update_obj(
-                        cs.name, cs, value=cs_type.default, version=cs_type.version
+                        cs, value=cs_type.default, version=cs_type.version
                     )
             else:
-                execute(cs.name, "delete", lambda: cs.delete())
+                execute(cs.name, "delete", None)
+
+    if apply and records:
+        STORAGE.save_many(records, set_source=True)
 
     return changes
 
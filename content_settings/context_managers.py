@@ -14,17 +14,20 @@ class content_settings_context(ContextDecorator):
     outside of the content_settings module can be used for testing.
 
     `_raise_errors: bool = True` - if False, then ignore errors when applying value of the setting.
+
+    `_py_values: dict = None` - python objects that were already converted from the same raw values. They are used instead of `to_python` and objects that were converted inside of the context are added to the dict with `update`.
     """
 
     def __init__(self, **values) -> None:
         self.raise_errors = values.pop("_raise_errors", True)
+        self.py_values = values.pop("_py_values", None)
         super().__init__()
         self.values_to_update = values
         self.prev_values = {}
         self.prev_types = {}
 
     def __enter__(self):
-        from content_settings.caching import set_new_value, set_new_type
+        from content_settings.caching import set_new_value, set_new_type, set_py_value
 
         for name, new_value in self.values_to_update.items():
             if isinstance(new_value, tuple):
@@ -39,6 +42,9 @@ class content_settings_context(ContextDecorator):
             except:
                 if self.raise_errors:
                     raise
+                continue
+            if self.py_values is not None and name in self.py_values:
+                set_py_value(name, self.py_values[name])
 
     def __exit__(self, *exc):
         from content_settings.caching import (
@@ -46,8 +52,20 @@ class content_settings_context(ContextDecorator):
             replace_user_type,
             delete_user_value,
             delete_value,
+            get_converted_py_values,
         )
 
+        if self.py_values is not None:
+            self.py_values.update(
+                {
+                    name: py_value
+                    for name, py_value in get_converted_py_values(
+                        self.prev_values
+                    ).items()
+                    if name not in self.py_values
+                }
+            )
+
         for name, new_value in self.prev_values.items():
             if name in self.prev_types:
                 if self.prev_types[name] is None:
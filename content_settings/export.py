@@ -3,11 +3,13 @@ Module for exporting, previewing and importing content settings from and to JSON
 """
 
 import json
+import time
 
 from django.utils.translation import gettext as _
 from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
 
-from typing import Iterable, Tuple, List, Optional, Dict
+from typing import Any, IO, Iterable, Iterator, Tuple, List, Optional, Dict
 
 from .types import BaseSetting
 from .models import ContentSetting, HistoryContentSetting, UserPreview
@@ -16,6 +18,7 @@ from .conf import (
     get_type_by_name,
     validate_all_with_context,
 )
+from .caching import map_in_context
 from .migrate import import_settings
 
 
@@ -31,53 +34,170 @@ class Error(Exception):
         return self.message
 
 
-def export_to_format(content_settings: Iterable[ContentSetting]) -> str:
+EXPORT_FORMATS = ("json", "compact", "ndjson")
+
+
+def export_setting(cs: ContentSetting) -> Dict:
     """
-    Export content settings to JSON format
+    Export a single content setting to a dict in the export format
+    """
+    if cs.user_defined_type:
+        return {
+            "value": cs.value,
+            "tags": cs.tags,
+            "help": cs.help,
+            "version": cs.version,
+            "user_defined_type": cs.user_defined_type,
+        }
+    return {
+        "value": cs.value,
+        "version": cs.version,
+    }
+
+
+def export_to_data(content_settings: Iterable[ContentSetting]) -> Dict:
+    """
+    Export content settings to a dict `{"settings": {name: {...}}}`
+    """
+    return {"settings": {cs.name: export_setting(cs) for cs in content_settings}}
+
+
+def iter_export(
+    content_settings: Iterable[ContentSetting], format: str = "json"
+) -> Iterator[str]:
     """
-    data = {}
-    data_settings = data["settings"] = {}
+    Export content settings chunk by chunk, so the whole export is never kept in memory. A queryset is read with `.iterator()`.
+
+    Formats:
+    - `json` - the same output as `export_to_format`
+    - `compact` - JSON without spaces
+    - `ndjson` - one JSON line per setting with the name of the setting in the `name` key
+    """
+    assert format in EXPORT_FORMATS, f"Unknown export format {format}"
+    if isinstance(content_settings, QuerySet):
+        content_settings = content_settings.iterator()
+
+    if format == "ndjson":
+        for cs in content_settings:
+            yield json.dumps({"name": cs.name, **export_setting(cs)}) + "\n"
+        return
+
+    if format == "compact":
+        yield '{"settings":{'
+        for i, cs in enumerate(content_settings):
+            yield ("," if i else "") + json.dumps(
+                {cs.name: export_setting(cs)}, separators=(",", ":")
+            )[1:-1]
+        yield "}}"
+        return
+
+    empty = True
     for cs in content_settings:
+        chunk = json.dumps({cs.name: export_setting(cs)}, indent=2)[2:-2]
+        yield ('{\n  "settings": {\n' if empty else ",\n") + chunk.replace(
+            "\n", "\n  "
+        ).join(["  ", ""])
+        empty = False
+    yield '{\n  "settings": {}\n}' if empty else "\n  }\n}"
 
-        if cs.user_defined_type:
-            data_settings[cs.name] = {
-                "value": cs.value,
-                "tags": cs.tags,
-                "help": cs.help,
-                "version": cs.version,
-                "user_defined_type": cs.user_defined_type,
-            }
-        else:
-            data_settings[cs.name] = {
-                "value": cs.value,
-                "version": cs.version,
-            }
 
-    return json.dumps(data, indent=2)
+def export_to_format(content_settings: Iterable[ContentSetting]) -> str:
+    """
+    Export content settings to JSON format
+    """
+    return "".join(iter_export(content_settings))
 
 
-def preview_data(data: dict, user: Optional[User] = None) -> Tuple[List, List, List]:
+def preview_data(
+    data: dict, user: Optional[User] = None, timings: Optional[Dict] = None
+) -> Tuple[List, List, List]:
     """
     Validate data and return three lists: errors, applied, skipped
 
     Those list are used for previewing import and applying import.
+
+    All settings from the data are loaded from the DB with a single query. If `timings` dict is given, it is filled with seconds spent on each phase: `load`, `diff` and `validate`.
     """
+    if timings is None:
+        timings = {}
     errors = []
     applied = []
     skipped = []
-    for name, value in data["settings"].items():
+    names = list(data["settings"].keys())
+
+    start = time.perf_counter()
+    db_settings = ContentSetting.objects.in_bulk(names, field_name="name")
+    timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    diffs = {}
+    for name in names:
         try:
-            if applied_row := applied_preview(name, value, user):
-                applied.append(applied_row)
-            else:
-                skipped.append({"name": name, "reason": _("Value is the same")})
+            diffs[name] = (
+                applied_preview(
+                    name, data["settings"][name], user, db_settings, validate=False
+                ),
+                None,
+            )
         except Exception as e:
-            errors.append({"name": name, "reason": str(e)})
+            diffs[name] = (None, e)
+    timings["diff"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    validate_names = [
+        name
+        for name in names
+        if diffs[name][1] is None
+        and (diffs[name][0] or "user_defined_type" in data["settings"][name])
+    ]
+    results = map_in_context(
+        lambda name: get_preview_type(name, data["settings"][name]).validate_value(
+            data["settings"][name]["value"]
+        ),
+        validate_names,
+    )
+    for name, (validated, error) in zip(validate_names, results):
+        if error is not None:
+            diffs[name] = (None, error)
+    timings["validate"] = time.perf_counter() - start
+
+    for name in names:
+        applied_row, error = diffs[name]
+        if error is not None:
+            errors.append({"name": name, "reason": str(error)})
+        elif applied_row:
+            applied.append(applied_row)
+        else:
+            skipped.append({"name": name, "reason": _("Value is the same")})
     return errors, applied, skipped
 
 
+def get_preview_type(name: str, value: dict) -> Optional[BaseSetting]:
+    """
+    the type that is used for validation of the imported value.
+    """
+    if "user_defined_type" in value:
+        return USER_DEFINED_TYPES_INITIAL.get(value["user_defined_type"])
+    return get_type_by_name(name)
+
+
+def get_db_setting(
+    name: str, db_settings: Optional[Dict[str, ContentSetting]] = None
+) -> Optional[ContentSetting]:
+    """
+    the setting from prefetched `db_settings` or from the DB if `db_settings` is None.
+    """
+    if db_settings is None:
+        return ContentSetting.objects.filter(name=name).first()
+    return db_settings.get(name)
+
+
 def applied_preview(
-    name: str, value: dict, user: Optional[User] = None
+    name: str,
+    value: dict,
+    user: Optional[User] = None,
+    db_settings: Optional[Dict[str, ContentSetting]] = None,
+    validate: bool = True,
 ) -> Optional[dict]:
     """
     the function returns applied element for previewing import.
@@ -85,14 +205,17 @@ def applied_preview(
     if function returns None, the setting is not applied, added to skipped list instead.
 
     if function raises an exception, the setting is not applied, added to errors list instead.
+
+    `db_settings` - settings prefetched from the DB by name, `validate` - validate the new value.
     """
 
     if "user_defined_type" in value:
-        return applied_preview_user_defined_type(name, value, user)
+        return applied_preview_user_defined_type(
+            name, value, user, db_settings, validate
+        )
 
-    try:
-        db_setting = ContentSetting.objects.get(name=name)
-    except ContentSetting.DoesNotExist:
+    db_setting = get_db_setting(name, db_settings)
+    if db_setting is None:
         raise Error(_("Setting does not exist"))
 
     cs_type = get_type_by_name(name)
@@ -113,7 +236,8 @@ def applied_preview(
     if user is not None and not cs_type.can_update(user):
         raise Error(_("You don't have permissions to update the setting"))
 
-    cs_type.validate_value(value["value"])
+    if validate:
+        cs_type.validate_value(value["value"])
 
     return {
         "name": name,
@@ -124,7 +248,11 @@ def applied_preview(
 
 
 def applied_preview_user_defined_type(
-    name: str, value: dict, user: Optional[User] = None
+    name: str,
+    value: dict,
+    user: Optional[User] = None,
+    db_settings: Optional[Dict[str, ContentSetting]] = None,
+    validate: bool = True,
 ) -> Optional[dict]:
     """
     `applied_preview` for user defined type.
@@ -144,11 +272,11 @@ def applied_preview_user_defined_type(
     if user is not None and not cs_type.can_update(user):
         raise Error(_("You don't have permissions to update the setting"))
 
-    cs_type.validate_value(value["value"])
+    if validate:
+        cs_type.validate_value(value["value"])
 
-    try:
-        db_setting = ContentSetting.objects.get(name=name)
-    except ContentSetting.DoesNotExist:
+    db_setting = get_db_setting(name, db_settings)
+    if db_setting is None:
         return {"name": name, "new_value": value, "full": value}
 
     if not db_setting.user_defined_type:
@@ -223,3 +351,146 @@ def import_to(
             model_cs_history=HistoryContentSetting,
             user=user,
         )
+
+
+NUMBER_START_CHARS = "-0123456789"
+NUMBER_CHARS = NUMBER_START_CHARS + "+.eE"
+HEX_CHARS = "0123456789abcdefABCDEF"
+LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+class JSONStream:
+    """
+    Minimal incremental reader of a JSON document from a file-like object. Only the structure of objects is walked by the stream, all other values are parsed with `json.JSONDecoder.raw_decode` as soon as they are fully read.
+    """
+
+    def __init__(self, fp: IO, chunk_size: int = 65536) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode("utf-8")
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                raise Error(_("Unexpected end of JSON"))
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise Error(_("Error JSON parsing: expected %s") % char)
+        self.pos += 1
+
+    def number_is_cut(self) -> bool:
+        """
+        True if the number at the current position can continue in the next chunk (e.g. `17`, `1.` or `1e`).
+        """
+        if self.eof or self.buffer[self.pos] not in NUMBER_START_CHARS:
+            return False
+        end = self.pos
+        while end < len(self.buffer) and self.buffer[end] in NUMBER_CHARS:
+            end += 1
+        return end == len(self.buffer)
+
+    def error_is_cut(self, error: json.JSONDecodeError) -> bool:
+        """
+        True if the error is caused by the end of the buffer, so the value can be parsed when more input is read. Otherwise the JSON is malformed.
+        """
+        tail = self.buffer[error.pos :]
+        if not tail or error.msg.startswith("Unterminated string"):
+            return True
+        if error.msg.startswith("Invalid \\uXXXX escape"):
+            return tail[:1] == "u" and all(char in HEX_CHARS for char in tail[1:])
+        return all(char in NUMBER_CHARS for char in tail) or any(
+            literal.startswith(tail) for literal in LITERALS
+        )
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            if self.number_is_cut() and self.read_more():
+                continue
+
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if not self.error_is_cut(e) or not self.read_more():
+                    raise Error(_("Error JSON parsing: %s") % e)
+                continue
+
+            self.pos = end
+            return value
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """
+        iterate over keys of the current object, the value of each key should be read before the next step.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise Error(_("Error JSON parsing: key is not a string"))
+            self.expect(":")
+            yield key
+            if self.peek() == "}":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def iter_import_settings(fp: IO, chunk_size: int = 65536) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally read a JSON file in the export format and yield `(name, value)` for every element of `settings`, so the whole file is never loaded in memory.
+    """
+    stream = JSONStream(fp, chunk_size)
+    found = False
+    for key in stream.items():
+        if key != "settings":
+            stream.value()
+            continue
+
+        if stream.peek() != "{":
+            raise Error(_("Wrong JSON format. Settings should be a dictionary"))
+        found = True
+        for name in stream.items():
+            yield name, stream.value()
+
+    if not found:
+        raise Error(_("Wrong JSON format. Settings should be set"))
+
+
+def iter_chunks(
+    items: Iterable[Tuple[str, Any]], size: int
+) -> Iterator[Dict[str, Dict]]:
+    """
+    group `(name, value)` pairs into data dicts `{"settings": {...}}` with at most `size` settings.
+    """
+    chunk = {}
+    for name, value in items:
+        chunk[name] = value
+        if len(chunk) >= size:
+            yield {"settings": chunk}
+            chunk = {}
+    if chunk:
+        yield {"settings": chunk}
@@ -0,0 +1,322 @@
+"""
+Writer of `HistoryContentSetting` records.
+
+If `CONTENT_SETTINGS_HISTORY_BATCH` is True, records that are created inside of a transaction are kept in a buffer and written with a single `bulk_create` (one per savepoint with records) when the transaction is committed, records of a released savepoint are moved to the parent batch and records of a rolled back savepoint are dropped, so the cost of the history does not grow with the number of saved settings. The batch can be handed to a background worker with `CONTENT_SETTINGS_HISTORY_WRITER`. Outside of a transaction records are written immediately.
+
+The module also has functions for compaction and retention of the history, see `content_settings_history_compact` command.
+"""
+
+import json
+from datetime import timedelta
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from asgiref.local import Local
+from django.db import transaction
+from django.db.models import F, Max, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .settings import HISTORY_BATCH, HISTORY_WRITER
+from .utils import call_base_str
+
+DATA = Local()
+
+
+def write_records(records: List) -> None:
+    """
+    the default writer of the batch of history records.
+    """
+    from .models import HistoryContentSetting
+
+    HistoryContentSetting.objects.bulk_create(records)
+
+
+def flush(records: List) -> None:
+    """
+    write the batch of history records with `CONTENT_SETTINGS_HISTORY_WRITER`
+    """
+    if not records:
+        return
+    call_base_str(HISTORY_WRITER or write_records, list(records))
+    del records[:]
+
+
+def is_pending(connection, callback) -> bool:
+    """
+    True if the on_commit callback is still waiting for the commit.
+    """
+    return any(entry[1] is callback for entry in connection.run_on_commit)
+
+
+def get_batches(connection) -> Dict[Tuple, Tuple]:
+    """
+    batches of the current transaction by savepoint ids: `(flush callback, records)`.
+
+    Django drops on_commit callbacks of a rolled back savepoint (and all callbacks when the transaction is finished), so batches without a pending callback are never reused.
+
+    Records of a released savepoint are moved to the batch of the parent, so records are always flushed in the order they were created. If the parent has no batch, the batch of the released savepoint becomes the batch of the parent (the callback of the released savepoint belongs to the parent for Django as well).
+    """
+    active = tuple(connection.savepoint_ids)
+    batches = {
+        key: batch
+        for key, batch in getattr(DATA, "batches", {}).items()
+        if is_pending(connection, batch[0])
+    }
+    while True:
+        released = [key for key in batches if active[: len(key)] != key]
+        if not released:
+            break
+        key = max(released, key=len)
+        callback, records = batches.pop(key)
+        parent = key[:-1]
+        if parent in batches:
+            batches[parent][1].extend(records)
+            del records[:]
+        else:
+            batches[parent] = (callback, records)
+    DATA.batches = batches
+    return batches
+
+
+def get_batch(create: bool = False) -> Optional[List]:
+    """
+    the batch of records of the current transaction (or savepoint), None if there is no transaction.
+
+    Each savepoint has its own batch that is flushed with its own on_commit callback, so records of a rolled back savepoint are dropped together with the callback.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+
+    key = tuple(connection.savepoint_ids)
+    batches = get_batches(connection)
+    if key in batches:
+        return batches[key][1]
+
+    if not create:
+        return None
+
+    records = []
+
+    def callback():
+        flush(records)
+
+    transaction.on_commit(callback)
+    batches[key] = (callback, records)
+    return records
+
+
+def add_records(records: List) -> None:
+    """
+    write history records, or add them to the batch of the current transaction if `CONTENT_SETTINGS_HISTORY_BATCH` is True.
+    """
+    from .models import HistoryContentSetting
+
+    if not HISTORY_BATCH:
+        HistoryContentSetting.objects.bulk_create(records)
+        return
+
+    batch = get_batch(create=True)
+    if batch is None:
+        flush(list(records))
+    else:
+        batch.extend(records)
+
+
+def get_pending_record(name: str) -> Optional[object]:
+    """
+    the last record for the name that is not written yet.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+
+    # batches of active savepoints only, the deepest one has the latest records
+    batches = get_batches(connection)
+    for key in sorted(batches, key=len, reverse=True):
+        records = batches[key][1]
+        for record in reversed(records):
+            if record.name == name:
+                return record
+    return None
+
+
+ARCHIVE_FIELDS = (
+    "id",
+    "created_on",
+    "name",
+    "value",
+    "version",
+    "was_changed",
+    "by_user",
+    "user_id",
+    "help",
+    "tags",
+    "user_defined_type",
+)
+
+
+def get_last_ids() -> Set[int]:
+    """
+    ids of the last record for each name. Those records are never removed by the compaction.
+    """
+    return set(get_last_ids_queryset())
+
+
+def get_last_ids_queryset():
+    from .models import HistoryContentSetting
+
+    return (
+        HistoryContentSetting.objects.order_by()
+        .values("name")
+        .annotate(last_id=Max("id"))
+        .values_list("last_id", flat=True)
+    )
+
+
+def get_duplicates():
+    """
+    queryset of records that are the same as the previous record for the same name. The same records are skipped by `HistoryContentSetting.gen_unique_records`, so they can be removed. The comparison is made by the DB.
+
+    The last record for each name is always kept.
+
+    Removing a duplicate does not change the result for other records (the next record is compared with a record that has the same values), so the queryset can be used for removing chunk by chunk.
+    """
+    from .models import HistoryContentSetting
+
+    # the last records are the last in the window, so excluding them does not change previous records of others
+    return HistoryContentSetting.same_as_previous(
+        HistoryContentSetting.objects.order_by().exclude(id__in=get_last_ids_queryset())
+    )
+
+
+def iter_duplicate_ids() -> Iterator[int]:
+    """
+    ids of records from `get_duplicates`
+    """
+    yield from get_duplicates().order_by().values_list("id", flat=True).iterator()
+
+
+def iter_retention_ids(
+    max_age: Optional[int] = None, max_count: Optional[int] = None
+) -> Iterator[int]:
+    """
+    ids of records that are out of the retention policy for each name:
+    * `max_age` - records older than the number of days
+    * `max_count` - records except the given number of the last records
+
+    Duplicates (see `get_duplicates`) are not counted and not returned, as they are removed before the retention policy is applied. The last record for each name is always kept.
+    """
+    from .models import HistoryContentSetting
+
+    queryset = HistoryContentSetting.objects.exclude(
+        id__in=get_duplicates().values("id")
+    )
+    last_ids = get_last_ids()
+
+    if max_count is not None:
+        for id, number in (
+            queryset.annotate(
+                number=Window(
+                    RowNumber(), partition_by=[F("name")], order_by=F("id").desc()
+                )
+            )
+            .order_by()
+            .values_list("id", "number")
+            .iterator()
+        ):
+            if number > max_count and id not in last_ids:
+                yield id
+
+    if max_age is not None:
+        for id in (
+            queryset.filter(created_on__lt=timezone.now() - timedelta(days=max_age))
+            .order_by()
+            .values_list("id", flat=True)
+            .iterator()
+        ):
+            if id not in last_ids:
+                yield id
+
+
+def count_compact(
+    max_age: Optional[int] = None, max_count: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    returns the numbers of records that are removed by `compact`: `(duplicates, out of retention)`
+    """
+    retention = 0
+    if max_age is not None or max_count is not None:
+        retention = len(set(iter_retention_ids(max_age, max_count)))
+    return get_duplicates().count(), retention
+
+
+def compact(
+    max_age: Optional[int] = None,
+    max_count: Optional[int] = None,
+    archive: Optional[IO] = None,
+    chunk_size: int = 1000,
+) -> Tuple[int, int]:
+    """
+    remove duplicates and then records that are out of the retention policy. Returns the numbers of removed records: `(duplicates, out of retention)`
+
+    Retention ids are calculated without duplicates, so the result is the same as `count_compact` returns before the call.
+    """
+    from .models import HistoryContentSetting
+
+    deleted = 0
+    last_id = 0
+    duplicate_ids = get_duplicates().values("id")
+    while True:
+        chunk = list(
+            HistoryContentSetting.objects.filter(id__gt=last_id, id__in=duplicate_ids)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            break
+        deleted += delete_records(chunk, archive)
+        last_id = chunk[-1]
+
+    deleted_retention = 0
+    if max_age is not None or max_count is not None:
+        deleted_retention = prune(
+            iter_retention_ids(max_age, max_count), archive, chunk_size
+        )
+    return deleted, deleted_retention
+
+
+def delete_records(ids: List[int], archive: Optional[IO] = None) -> int:
+    """
+    delete records by ids. Deleted records are written into `archive` as JSON lines before the deletion.
+    """
+    from .models import HistoryContentSetting
+
+    queryset = HistoryContentSetting.objects.filter(id__in=ids)
+    if archive is not None:
+        for row in queryset.order_by("id").values(*ARCHIVE_FIELDS):
+            row["created_on"] = row["created_on"].isoformat()
+            archive.write(json.dumps(row) + "\n")
+    return queryset.delete()[0]
+
+
+def prune(
+    ids: Iterable[int], archive: Optional[IO] = None, chunk_size: int = 1000
+) -> int:
+    """
+    delete records by ids chunk by chunk (see `delete_records`).
+
+    ids are collected before the first deletion, so the generators above can be used directly.
+
+    returns the number of deleted records.
+    """
+    deleted = 0
+    chunk = []
+    for id in sorted(set(ids)):
+        chunk.append(id)
+        if len(chunk) >= chunk_size:
+            deleted += delete_records(chunk, archive)
+            chunk = []
+    if chunk:
+        deleted += delete_records(chunk, archive)
+    return deleted
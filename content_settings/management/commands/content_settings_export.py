@@ -1,7 +1,7 @@
-import json
-from django.core.management.base import BaseCommand
+import gzip
+from django.core.management.base import BaseCommand, CommandError
 from content_settings.models import ContentSetting
-from content_settings.export import export_to_format
+from content_settings.export import iter_export, EXPORT_FORMATS
 
 
 class Command(BaseCommand):
@@ -14,14 +14,45 @@ class Command(BaseCommand):
             type=str,
             help="Names of the content settings to export. If not provided, all content settings will be exported.",
         )
+        parser.add_argument(
+            "--format",
+            choices=EXPORT_FORMATS,
+            default="json",
+            help="json - indented JSON, compact - JSON without spaces, ndjson - one JSON line per setting.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Path to the file for the export. If not provided, the export is written to STDOUT.",
+        )
+        parser.add_argument(
+            "--gzip",
+            action="store_true",
+            default=False,
+            help="Compress the output file with gzip. Is used by default if the output file ends with .gz",
+        )
 
     def handle(self, *args, **options):
         names = options["names"]
+        output = options["output"]
+        use_gzip = options["gzip"] or (output is not None and output.endswith(".gz"))
+        if use_gzip and output is None:
+            raise CommandError("--gzip requires --output")
+
         if names:
             content_settings = ContentSetting.objects.filter(name__in=names)
         else:
             content_settings = ContentSetting.objects.all()
 
-        json_data = export_to_format(content_settings)
+        chunks = iter_export(content_settings, options["format"])
+
+        if output is None:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            self.stdout.write("")
+            return
 
-        self.stdout.write(json_data)
+        with (gzip.open if use_gzip else open)(output, "wt") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from content_settings.models import ContentSetting
+from content_settings.export import export_to_data
+from content_settings.storages import dump_frozen
+
+
+class Command(BaseCommand):
+    help = "Freeze values of content settings from the database into a python module (.py) or a marshal file (.marshal) that can be used with CONTENT_SETTINGS_FROZEN."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "output",
+            type=str,
+            help="Path to the generated file. The format is taken from the extension: .py or .marshal",
+        )
+        parser.add_argument(
+            "--names",
+            nargs="+",
+            type=str,
+            help="Names of the content settings to freeze. If not provided, all content settings will be frozen.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["names"]
+        if names:
+            content_settings = ContentSetting.objects.filter(name__in=names)
+        else:
+            content_settings = ContentSetting.objects.all()
+
+        data = export_to_data(content_settings.order_by("name"))
+        checksum = dump_frozen(data, options["output"])
+
+        self.stdout.write(
+            f"{len(data['settings'])} settings are frozen into {options['output']} (checksum: {checksum})"
+        )
@@ -0,0 +1,55 @@
+import gzip
+from django.core.management.base import BaseCommand
+from content_settings.history import compact, count_compact
+
+
+class Command(BaseCommand):
+    help = "Compact the history of content settings: remove records that are the same as the previous ones and records that are out of the retention policy."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=None,
+            help="Remove records older than the number of days. The last record of each setting is always kept.",
+        )
+        parser.add_argument(
+            "--max-count",
+            type=int,
+            default=None,
+            help="Keep only the number of the last records for each setting.",
+        )
+        parser.add_argument(
+            "--archive",
+            type=str,
+            default=None,
+            help="Path to a gzip compressed NDJSON file for removed records. The file is appended if it exists.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Show the number of records that would be removed without removing them.",
+        )
+
+    def handle(self, *args, **options):
+        max_age = options["max_age"]
+        max_count = options["max_count"]
+
+        if options["dry_run"]:
+            duplicates, retention = count_compact(max_age, max_count)
+            self.stdout.write(
+                f"{duplicates} duplicated records and {retention} records out of retention would be removed"
+            )
+            return
+
+        archive = gzip.open(options["archive"], "at") if options["archive"] else None
+        try:
+            deleted, deleted_retention = compact(max_age, max_count, archive)
+        finally:
+            if archive is not None:
+                archive.close()
+
+        self.stdout.write(
+            f"{deleted} duplicated records and {deleted_retention} records out of retention are removed"
+        )
@@ -1,7 +1,13 @@
 import argparse
 import json
-from django.core.management.base import BaseCommand
-from content_settings.export import preview_data, import_to
+from django.core.management.base import BaseCommand, CommandError
+from content_settings.export import (
+    preview_data,
+    import_to,
+    iter_import_settings,
+    iter_chunks,
+    Error,
+)
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -47,6 +53,18 @@ class Command(BaseCommand):
             default=False,
             help="Show only errors.",
         )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            default=False,
+            help="Read the file incrementally, preview and import it by chunks and print results as NDJSON.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of settings in a chunk for --stream.",
+        )
 
     def handle(self, *args, **options):
         filename = options["filename"]
@@ -56,13 +74,30 @@ class Command(BaseCommand):
         show_skipped = options["show_skipped"]
         show_only_errors = options["show_only_errors"]
 
-        with open(filename, "r") as file:
-            data = json.load(file)
-
         if preview_for:
             preview_for = User.objects.get(username=preview_for)
 
-        errors, applied, skipped = preview_data(data, preview_for)
+        if options["stream"]:
+            with open(filename, "r") as file:
+                try:
+                    self.handle_stream(
+                        file,
+                        do_import=do_import,
+                        preview_for=preview_for,
+                        names=names,
+                        show_skipped=show_skipped,
+                        show_only_errors=show_only_errors,
+                        chunk_size=options["chunk_size"],
+                    )
+                except Error as e:
+                    raise CommandError(str(e))
+            return
+
+        with open(filename, "r") as file:
+            data = json.load(file)
+
+        timings = {}
+        errors, applied, skipped = preview_data(data, preview_for, timings)
 
         if skipped and show_skipped and not show_only_errors:
             self.stdout.write("Skipped:")
@@ -76,6 +111,14 @@ class Command(BaseCommand):
             self.stdout.write("Applied:")
             self.stdout.write(json.dumps(applied, indent=2))
 
+        if not show_only_errors:
+            self.stdout.write(
+                "Timing: "
+                + ", ".join(
+                    "%s %.3fs" % (phase, seconds) for phase, seconds in timings.items()
+                )
+            )
+
         if do_import or preview_for:
             if names:
                 applied = [row for row in applied if row["name"] in names]
@@ -90,3 +133,49 @@ class Command(BaseCommand):
                 )
             else:
                 self.stdout.write(self.style.SUCCESS("Import completed."))
+
+    def write_row(self, status, row):
+        self.stdout.write(json.dumps({"status": status, **row}))
+
+    def handle_stream(
+        self,
+        file,
+        do_import,
+        preview_for,
+        names,
+        show_skipped,
+        show_only_errors,
+        chunk_size,
+    ):
+        """
+        preview and import settings chunk by chunk, each result is printed as a JSON line
+        """
+        items = iter_import_settings(file)
+        counts = {"errors": 0, "applied": 0, "skipped": 0}
+        timings = {}
+        for data in iter_chunks(items, chunk_size):
+            chunk_timings = {}
+            errors, applied, skipped = preview_data(data, preview_for, chunk_timings)
+
+            for row in errors:
+                self.write_row("error", row)
+            if not show_only_errors:
+                for row in applied:
+                    self.write_row("applied", row)
+                if show_skipped:
+                    for row in skipped:
+                        self.write_row("skipped", row)
+
+            if do_import or preview_for:
+                if names:
+                    applied = [row for row in applied if row["name"] in names]
+                if applied:
+                    import_to(data, applied, preview_for is not None, preview_for)
+
+            counts["errors"] += len(errors)
+            counts["applied"] += len(applied)
+            counts["skipped"] += len(skipped)
+            for phase, seconds in chunk_timings.items():
+                timings[phase] = timings.get(phase, 0) + seconds
+
+        self.write_row("summary", {**counts, "timings": timings})
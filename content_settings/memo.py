@@ -0,0 +1,93 @@
+"""
+Process-wide memo of python objects converted from raw values.
+
+The same raw value is converted by `to_python` in every thread, in every `content_settings_context` and for every preview. For types with `to_python_memo = True` the converted object is shared between threads and contexts of the process, so each raw value is converted only once.
+
+The memo is a bounded LRU, the size is set by `CONTENT_SETTINGS_TO_PYTHON_MEMO_SIZE`. The key is the type instance (with its version) and a digest of the raw value.
+
+Only types where `to_python` is deterministic and the result is never mutated should use the memo.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from .settings import TO_PYTHON_MEMO_SIZE
+
+
+class ToPythonMemo:
+    """
+    Arguments:
+        * size (int): the max number of python objects in the memo
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.lock = threading.Lock()
+        self.values: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, cs_type: Any, value: str) -> Tuple[Any, str, bytes]:
+        return (
+            cs_type,
+            cs_type.version,
+            hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest(),
+        )
+
+    def to_python(self, cs_type: Any, value: str) -> Any:
+        """
+        returns `cs_type.to_python(value)` from the memo or converts and saves it to the memo.
+        """
+        if self.size <= 0 or not isinstance(value, str):
+            return cs_type.to_python(value)
+
+        key = self.get_key(cs_type, value)
+        with self.lock:
+            if key in self.values:
+                self.hits += 1
+                self.values.move_to_end(key)
+                return self.values[key]
+            self.misses += 1
+
+        # errors of to_python are not saved
+        py_value = cs_type.to_python(value)
+
+        with self.lock:
+            self.values[key] = py_value
+            while len(self.values) > self.size:
+                self.values.popitem(last=False)
+
+        return py_value
+
+    def clear(self) -> None:
+        """
+        remove all values and reset the metrics
+        """
+        with self.lock:
+            self.values = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+
+    def hit_rate(self) -> float:
+        """
+        the ratio of hits to all requests to the memo
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        metrics of the memo: `hits`, `misses`, `hit_rate`, `size` (the number of stored values) and `max_size`
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "size": len(self.values),
+            "max_size": self.size,
+        }
+
+
+MEMO = ToPythonMemo(TO_PYTHON_MEMO_SIZE)
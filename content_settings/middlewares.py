@@ -5,31 +5,46 @@ Available middlewares for the content settings.
 from django.urls import reverse
 
 from .context_managers import content_settings_context
-from .models import UserPreview
+from .preview import get_preview
 from .settings import PREVIEW_ON_SITE_SHOW
 
+ADMIN_PREFIX = None
+
+
+def get_admin_prefix() -> str:
+    """
+    the path of content settings admin, where the preview is not applied.
+    """
+    global ADMIN_PREFIX
+    if ADMIN_PREFIX is None:
+        ADMIN_PREFIX = reverse("admin:index") + "content_settings/"
+    return ADMIN_PREFIX
+
 
 def preview_on_site(get_response):
     """
     the middleware required for previewing the content settings on the site.
 
     It checks content_settings.can_preview_on_site permission for the user and if the user has it, then the middleware will preview the content settings for the user.
+
+    The preview of the user is cached until the user changes it (see `content_settings.preview`).
     """
 
     def middleware(request):
-        if not PREVIEW_ON_SITE_SHOW or not request.user.has_perm(
-            "content_settings.can_preview_on_site"
-        ):
+        if not PREVIEW_ON_SITE_SHOW or not request.user.is_authenticated:
             return get_response(request)
 
-        if request.path.startswith(reverse("admin:index") + "content_settings/"):
+        if request.path.startswith(get_admin_prefix()):
             return get_response(request)
 
-        preview_settings = UserPreview.get_context_dict(request.user)
-        if not preview_settings:
+        preview = get_preview(request.user)
+        if not preview:
             return get_response(request)
 
-        with content_settings_context(**preview_settings, _raise_errors=False):
+        preview_settings, py_values = preview
+        with content_settings_context(
+            **preview_settings, _raise_errors=False, _py_values=py_values
+        ):
             return get_response(request)
 
     return middleware
@@ -5,7 +5,8 @@ A set of functions that can be used inside migrations.
 from typing import Union, Optional, Type, Dict, Any
 import json
 
-from django.db import migrations, models
+from django.db import migrations, models, transaction
+from django.db.models.signals import pre_save
 from django.contrib.auth.models import User
 
 
@@ -98,7 +99,8 @@ def import_settings(
     model_cs: Type[models.Model],
     model_cs_history: Optional[Type[models.Model]] = None,
     user: Optional[User] = None,
-) -> None:
+    set_source: bool = True,
+) -> Dict[str, models.Model]:
     """
     Import content settings from a dictionary.
 
@@ -107,38 +109,100 @@ def import_settings(
         model_cs (Type[models.Model]): The ContentSetting model class.
         model_cs_history (Optional[Type[models.Model]]): The ContentSettingHistory model class, if history tracking is enabled.
         user (Optional[User]): The user performing the import, if applicable.
+        set_source (bool): Mark history records as made by the user (or by the app if user is None). If False, the source stays unknown.
 
     Returns:
-        None
+        Dict[str, models.Model]: created and updated settings by name.
 
-    This function iterates through the settings in the provided data dictionary,
-    creating or updating ContentSetting objects as necessary. It also handles
-    history tracking if a history model is provided.
+    Existing settings are fetched with a single query, new and changed settings are
+    written with `bulk_create`/`bulk_update` and history records with a single `bulk_create`
+    in one transaction.
+
+    `post_save` signals are not sent, so for the `ContentSetting` model the work of the receivers
+    (`on_change` triggers, the tag index and the checksum update) is done once for the whole import.
+    Removed settings are deleted with a single query and go through the regular `post_delete` receivers.
     """
-    for name, value in data["settings"].items():
-        cs = model_cs.objects.filter(name=name).first()
-        was_changed: Optional[bool] = cs is not None
-        if value is None:
-            was_changed = None
+    from .models import ContentSetting, ContentSettingTag
+    from .history import add_records as add_history_records
+
+    with_receivers = model_cs is ContentSetting
+    names = list(data["settings"].keys())
+    existing = model_cs.objects.in_bulk(names, field_name="name")
 
+    to_create = []
+    to_update = []
+    to_delete = []
+    for name, value in data["settings"].items():
+        cs = existing.get(name)
         if value is None:
             if cs:
-                cs.delete()
+                to_delete.append(cs)
+            continue
+
+        if not cs:
+            cs = model_cs(name=name)
+        for key, in_value in value.items():
+            setattr(cs, key, in_value)
+        pre_save.send(
+            sender=model_cs, instance=cs, raw=False, using=model_cs.objects.db
+        )
+
+        if cs.pk is None:
+            to_create.append(cs)
         else:
-            if not cs:
-                cs = model_cs(name=name)
-            for key, in_value in value.items():
-                setattr(cs, key, in_value)
-            cs.save()
-
-        if user is not None:
-            model_cs_history.update_last_record_for_name(name, user)
-
-        elif model_cs_history is not None:
-            history = model_cs_history(
-                name=name, was_changed=was_changed, by_user=False
+            to_update.append(cs)
+
+    with transaction.atomic(using=model_cs.objects.db):
+        if to_create:
+            model_cs.objects.bulk_create(to_create)
+        if to_update:
+            model_cs.objects.bulk_update(
+                to_update, ["value", "version", "help", "tags", "user_defined_type"]
             )
+        if to_delete:
+            model_cs.objects.filter(pk__in=[cs.pk for cs in to_delete]).delete()
+        if with_receivers:
+            ContentSettingTag.sync(to_create + to_update)
+
+        if model_cs_history is not None:
+            history = [(cs, False) for cs in to_create] + [
+                (cs, True) for cs in to_update
+            ]
+            if not with_receivers:
+                history += [(cs, None) for cs in to_delete]
+
+            records = [
+                model_cs_history(
+                    name=cs.name,
+                    value=cs.value,
+                    version=cs.version,
+                    tags=cs.tags,
+                    help=cs.help,
+                    user_defined_type=cs.user_defined_type,
+                    was_changed=was_changed,
+                    by_user=(user is not None) if set_source else None,
+                    user=user if set_source else None,
+                )
+                for cs, was_changed in history
+            ]
+            if with_receivers:
+                add_history_records(records)
+                if set_source:
+                    for cs in to_delete:
+                        model_cs_history.update_last_record_for_name(cs.name, user)
+            else:
+                model_cs_history.objects.bulk_create(records)
+
+    saved = {cs.name: cs for cs in to_create + to_update}
+    if not with_receivers:
+        return saved
+
+    from .receivers import trigger_on_change, do_update_stored_checksum
+
+    for cs in to_update:
+        trigger_on_change(model_cs, cs, created=False)
+
+    if to_create or to_update or to_delete:
+        do_update_stored_checksum()
 
-            for key, in_value in value.items():
-                setattr(history, key, in_value)
-            history.save()
+    return saved
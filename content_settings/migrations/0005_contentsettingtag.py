@@ -0,0 +1,45 @@
+from django.db import migrations, models
+
+
+def fill_tags(apps, schema_editor):
+    ContentSetting = apps.get_model("content_settings", "ContentSetting")
+    ContentSettingTag = apps.get_model("content_settings", "ContentSettingTag")
+
+    ContentSettingTag.objects.bulk_create(
+        [
+            ContentSettingTag(name=name, tag=tag)
+            for name, tags in ContentSetting.objects.exclude(tags=None).values_list(
+                "name", "tags"
+            )
+            for tag in set(tag for tag in tags.splitlines() if tag.strip())
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content_settings", "0004_userdefined_preview"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentSettingTag",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=200, verbose_name="Name")),
+                (
+                    "tag",
+                    models.CharField(db_index=True, max_length=200, verbose_name="Tag"),
+                ),
+            ],
+            options={
+                "unique_together": {("name", "tag")},
+            },
+        ),
+        migrations.RunPython(fill_tags, migrations.RunPython.noop),
+    ]
@@ -4,7 +4,9 @@ Django Models for the content settings.
 
 from collections import defaultdict
 from functools import cached_property
-from django.db import models
+import django
+from django.db import models, connections
+from django.db.models.functions import Lag
 from django.core.validators import RegexValidator
 from django.utils import timezone
 from django.conf import settings
@@ -12,7 +14,7 @@ from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
-from typing import Optional
+from typing import Iterable, Optional
 from datetime import timedelta
 
 User = get_user_model()
@@ -69,6 +71,57 @@ class ContentSetting(models.Model):
         return self.name
 
 
+class ContentSettingTag(models.Model):
+    """
+    Index of tags of the content settings (`ContentSetting.tags`) for filtering by tags with indexed lookups.
+
+    The records are maintained by receivers of `ContentSetting` and by `migrate.import_settings`.
+    """
+
+    id = models.AutoField(primary_key=True, verbose_name=_("ID"))
+    name = models.CharField(max_length=200, verbose_name=_("Name"))
+    tag = models.CharField(max_length=200, db_index=True, verbose_name=_("Tag"))
+
+    class Meta:
+        unique_together = (("name", "tag"),)
+
+    def __str__(self):
+        return f"{self.name} - {self.tag}"
+
+    @classmethod
+    def sync(cls, content_settings: Iterable[ContentSetting]):
+        """
+        update tag records of the given settings with a single query for reading the current records.
+        """
+        content_settings = list(content_settings)
+        if not content_settings:
+            return
+
+        expected = {(cs.name, tag) for cs in content_settings for tag in cs.tags_set}
+        to_delete = []
+        for id, name, tag in cls.objects.filter(
+            name__in=[cs.name for cs in content_settings]
+        ).values_list("id", "name", "tag"):
+            if (name, tag) in expected:
+                expected.remove((name, tag))
+            else:
+                to_delete.append(id)
+
+        if to_delete:
+            cls.objects.filter(id__in=to_delete).delete()
+        if expected:
+            cls.objects.bulk_create(
+                [cls(name=name, tag=tag) for name, tag in sorted(expected)]
+            )
+
+    @classmethod
+    def names_with_tag(cls, tag: str):
+        """
+        subquery of names of the settings with the tag
+        """
+        return cls.objects.filter(tag=tag).values("name")
+
+
 class HistoryContentSetting(models.Model):
     """
     The model for the history of the content settings. Is used to store the history of changes for the content settings such as changed/added/removed.
@@ -116,6 +169,92 @@ class HistoryContentSetting(models.Model):
         max_length=50, null=True, default=None, verbose_name=_("User Defined Type")
     )
 
+    UNIQUE_FIELDS = ("value", "was_changed", "tags", "help", "user_defined_type")
+
+    @classmethod
+    def with_previous(
+        cls, queryset: Optional[models.QuerySet] = None, filterable: bool = False
+    ):
+        """
+        Annotate records with `previous_id` and `previous_<field>` for fields from `UNIQUE_FIELDS` - the fields of the previous record for the same name, calculated by the DB with `LAG()` window function.
+
+        The window is calculated over the records of the queryset, so the queryset should not be filtered by anything except names. For backends without window functions correlated subqueries are used instead.
+
+        If `filterable` is True, the annotations can be used in filters (Django can filter by window functions only since 4.2, so correlated subqueries are used for older versions).
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        fields = ("id",) + cls.UNIQUE_FIELDS
+
+        if not connections[queryset.db].features.supports_over_clause or (
+            filterable and django.VERSION < (4, 2)
+        ):
+            previous = cls.objects.filter(
+                name=models.OuterRef("name"), id__lt=models.OuterRef("id")
+            ).order_by("-id")
+            return queryset.annotate(
+                **{
+                    "previous_" + field: models.Subquery(previous.values(field)[:1])
+                    for field in fields
+                }
+            )
+
+        window = {"partition_by": [models.F("name")], "order_by": models.F("id").asc()}
+        return queryset.annotate(
+            **{
+                "previous_" + field: models.Window(Lag(field), **window)
+                for field in fields
+            }
+        )
+
+    @classmethod
+    def is_same_as_previous(cls, obj) -> bool:
+        """
+        The record annotated by `with_previous` is the same as the previous record for the same name.
+        """
+        return obj.previous_id is not None and all(
+            getattr(obj, field) == getattr(obj, "previous_" + field)
+            for field in cls.UNIQUE_FIELDS
+        )
+
+    @classmethod
+    def same_as_previous(cls, queryset: Optional[models.QuerySet] = None):
+        """
+        Records that are the same as the previous record for the same name. The same check as `is_same_as_previous`, but it is made by the DB.
+        """
+        condition = models.Q(previous_id__isnull=False)
+        for field in cls.UNIQUE_FIELDS:
+            condition &= models.Q(**{field: models.F("previous_" + field)}) | models.Q(
+                **{field + "__isnull": True, "previous_" + field + "__isnull": True}
+            )
+        return cls.with_previous(queryset, filterable=True).filter(condition)
+
+    @classmethod
+    def prefetch_previous(cls, records):
+        """
+        Fill `previous` of the records with two queries instead of a query per record.
+        """
+        records = list(records)
+        if not records:
+            return records
+
+        previous_ids = dict(
+            cls.with_previous(
+                cls.objects.filter(
+                    name__in={obj.name for obj in records},
+                    id__lte=max(obj.id for obj in records),
+                )
+            )
+            .order_by()
+            .values_list("id", "previous_id")
+        )
+        previous = cls.objects.in_bulk(
+            [id for id in previous_ids.values() if id is not None]
+        )
+        for obj in records:
+            obj.__dict__["previous"] = previous.get(previous_ids.get(obj.id))
+        return records
+
     @cached_property
     def previous(self):
         """
@@ -153,6 +292,15 @@ class HistoryContentSetting(models.Model):
         """
         Update the last record with the information about the source of the update.
         """
+        from .history import get_pending_record
+
+        last_setting = get_pending_record(name)
+        if last_setting is not None:
+            if last_setting.by_user is None:
+                last_setting.user = user
+                last_setting.by_user = user is not None
+            return
+
         last_setting = cls.objects.filter(name=name).first()
         if not last_setting or last_setting.by_user is not None:
             return
@@ -187,29 +335,12 @@ class HistoryContentSetting(models.Model):
         """
         The current issue is that sometimes the same setting is changed multiple times in a row.
         This method is used to generate unique records for the history.
-        """
-        next_obj = None
-        records = cls.objects.filter(name=name)
-        if not records.exists():
-            return []
 
-        for obj in records:
-            if next_obj is None:
-                next_obj = obj
-                continue
-
-            if (
-                next_obj.value != obj.value
-                or next_obj.was_changed != obj.was_changed
-                or next_obj.tags != obj.tags
-                or next_obj.help != obj.help
-                or next_obj.user_defined_type != obj.user_defined_type
-            ):
-                yield next_obj
-
-            next_obj = obj
-
-        yield obj
+        Previous records are found by the DB with a single query (see `with_previous`).
+        """
+        for obj in cls.with_previous(cls.objects.filter(name=name)).order_by("-id"):
+            if not cls.is_same_as_previous(obj):
+                yield obj
 
 
 class UserTagSetting(models.Model):
@@ -0,0 +1,113 @@
+"""
+Per-user cache of settings that are previewed on site (see `middlewares.preview_on_site`).
+
+Each user has a preview revision in the cache backend (`CONTENT_SETTINGS_PREVIEW_ON_SITE_CACHE_BACKEND`, it should be shared between processes), the revision is changed every time when a `UserPreview` of the user is saved or deleted.
+
+The process keeps a bounded LRU (the size is set by `CONTENT_SETTINGS_PREVIEW_ON_SITE_CACHE_SIZE`) of previews for the last revision of each user: raw values and python objects converted from them. So while the revision is the same, the preview is applied without querying `UserPreview`. The permission is checked on every request.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.core.cache import caches
+
+from .models import UserPreview
+from .settings import PREVIEW_ON_SITE_CACHE_SIZE, PREVIEW_ON_SITE_CACHE_BACKEND
+
+REVISION_KEY_PREFIX = "CS_PREVIEW_REVISION_"
+
+PREVIEWS: OrderedDict = OrderedDict()
+PREVIEWS_LOCK = threading.Lock()
+
+
+def get_revision_key(user_id: Any) -> str:
+    return f"{REVISION_KEY_PREFIX}{user_id}"
+
+
+def get_revision(user_id: Any) -> str:
+    """
+    the current preview revision of the user. A new revision is created if the cache has none.
+    """
+    cache = caches[PREVIEW_ON_SITE_CACHE_BACKEND]
+    key = get_revision_key(user_id)
+    revision = cache.get(key)
+    if revision is None:
+        revision = uuid.uuid4().hex
+        if not cache.add(key, revision, None):
+            revision = cache.get(key, revision)
+    return revision
+
+
+def bump_revision(user_id: Any) -> None:
+    """
+    invalidate cached previews of the user in all processes that share the cache backend (`CONTENT_SETTINGS_PREVIEW_ON_SITE_CACHE_BACKEND`).
+    """
+    caches[PREVIEW_ON_SITE_CACHE_BACKEND].set(
+        get_revision_key(user_id), uuid.uuid4().hex, None
+    )
+
+
+class PyValues(dict):
+    """
+    python objects converted from preview values. It is shared between request threads of the user, so it is updated under the lock.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def update(self, values: Dict[str, Any]) -> None:
+        with self.lock:
+            for name, py_value in values.items():
+                self.setdefault(name, py_value)
+
+
+def load_preview(user) -> Optional[Tuple[Dict[str, Any], PyValues]]:
+    """
+    returns `(values, py_values)` for the user or None if the user has nothing to preview.
+
+    `values` are arguments for `content_settings_context` and `py_values` is an (initially empty) dict of python objects converted from them.
+    """
+    values = UserPreview.get_context_dict(user)
+    if not values:
+        return None
+
+    return values, PyValues()
+
+
+def get_preview(user) -> Optional[Tuple[Dict[str, Any], PyValues]]:
+    """
+    the same as `load_preview`, but the result is cached for the current preview revision of the user. None if the user can not preview.
+    """
+    if not user.has_perm("content_settings.can_preview_on_site"):
+        return None
+
+    if PREVIEW_ON_SITE_CACHE_SIZE <= 0:
+        return load_preview(user)
+
+    revision = get_revision(user.pk)
+    with PREVIEWS_LOCK:
+        if user.pk in PREVIEWS and PREVIEWS[user.pk][0] == revision:
+            PREVIEWS.move_to_end(user.pk)
+            return PREVIEWS[user.pk][1]
+
+    # the revision is taken before loading, so a change during loading is not lost
+    preview = load_preview(user)
+
+    with PREVIEWS_LOCK:
+        PREVIEWS[user.pk] = (revision, preview)
+        PREVIEWS.move_to_end(user.pk)
+        while len(PREVIEWS) > PREVIEW_ON_SITE_CACHE_SIZE:
+            PREVIEWS.popitem(last=False)
+
+    return preview
+
+
+def clear() -> None:
+    """
+    remove all cached previews of the process
+    """
+    with PREVIEWS_LOCK:
+        PREVIEWS.clear()
@@ -20,13 +20,21 @@ from .settings import (
 from django.dispatch import receiver
 
 from .caching import (
+    STORAGE,
     check_update,
     recalc_checksums,
-    validate_default_values,
+    validate_default_values_once,
     populate,
 )
 from .conf import set_initial_values_for_db, get_type_by_name, get_str_tags
-from .models import ContentSetting, HistoryContentSetting
+from .models import (
+    ContentSetting,
+    ContentSettingTag,
+    HistoryContentSetting,
+    UserPreview,
+)
+from .history import add_records as add_history_records
+from .preview import bump_revision as bump_preview_revision
 from .utils import call_base_str
 
 
@@ -36,11 +44,17 @@ def do_update_stored_checksum(*args, **kwargs):
     """
     update the stored checksum of the settings.
     """
+
+    def recalc():
+        STORAGE.written()
+        recalc_checksums()
+
+    STORAGE.written()
     connection = transaction.get_connection()
     if connection.in_atomic_block:
-        transaction.on_commit(recalc_checksums)
+        transaction.on_commit(recalc)
     else:
-        recalc_checksums()
+        recalc()
 
 
 @receiver(post_save, sender=ContentSetting)
@@ -72,14 +86,18 @@ def trigger_on_change(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=ContentSetting)
 def create_history_settings(sender, instance, created, **kwargs):
-    HistoryContentSetting.objects.create(
-        name=instance.name,
-        value=instance.value,
-        version=instance.version,
-        tags=instance.tags,
-        help=instance.help,
-        user_defined_type=instance.user_defined_type,
-        was_changed=not created,
+    add_history_records(
+        [
+            HistoryContentSetting(
+                name=instance.name,
+                value=instance.value,
+                version=instance.version,
+                tags=instance.tags,
+                help=instance.help,
+                user_defined_type=instance.user_defined_type,
+                was_changed=not created,
+            )
+        ]
     )
 
 
@@ -110,23 +128,46 @@ if USER_DEFINED_TYPES:
             instance.tags = instance.tags.replace("\r\n", "\n")
 
 
+@receiver(post_save, sender=ContentSetting)
+def update_tag_index(sender, instance, **kwargs):
+    """
+    keep the tag index (`ContentSettingTag`) in sync with tags that were generated by `update_value_tags`
+    """
+    ContentSettingTag.sync([instance])
+
+
+@receiver(post_delete, sender=ContentSetting)
+def delete_tag_index(sender, instance, **kwargs):
+    ContentSettingTag.objects.filter(name=instance.name).delete()
+
+
 @receiver(post_delete, sender=ContentSetting)
 def create_history_settings_delete(sender, instance, **kwargs):
-    HistoryContentSetting.objects.create(
-        name=instance.name,
-        value=instance.value,
-        version=instance.version,
-        tags=instance.tags,
-        help=instance.help,
-        was_changed=None,
+    add_history_records(
+        [
+            HistoryContentSetting(
+                name=instance.name,
+                value=instance.value,
+                version=instance.version,
+                tags=instance.tags,
+                help=instance.help,
+                was_changed=None,
+            )
+        ]
     )
 
 
+@receiver(post_delete, sender=UserPreview)
+@receiver(post_save, sender=UserPreview)
+def update_preview_revision(sender, instance, **kwargs):
+    bump_preview_revision(instance.user_id)
+
+
 if VALIDATE_DEFAULT_VALUE:
 
     @receiver(connection_created)
     def validate_default_values_for_connection(*args, **kwargs):
-        validate_default_values()
+        validate_default_values_once()
 
 
 if PRECACHED_PY_VALUES:
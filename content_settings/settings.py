@@ -15,6 +15,10 @@ PREVIEW_ON_SITE_HREF = get_setting("PREVIEW_ON_SITE_HREF", "/")
 
 PREVIEW_ON_SITE_SHOW = get_setting("PREVIEW_ON_SITE_SHOW", False)
 
+PREVIEW_ON_SITE_CACHE_SIZE = get_setting("PREVIEW_ON_SITE_CACHE_SIZE", 1000)
+
+PREVIEW_ON_SITE_CACHE_BACKEND = get_setting("PREVIEW_ON_SITE_CACHE_BACKEND", "default")
+
 UPDATE_DB_VALUES_BY_MIGRATE = get_setting("UPDATE_DB_VALUES_BY_MIGRATE", True)
 
 TAGS = get_setting(
@@ -55,10 +59,45 @@ elif isinstance(CACHE_TRIGGER, dict) and "backend" not in CACHE_TRIGGER:
         **CACHE_TRIGGER,
     }
 
+STORAGE = get_setting("STORAGE", "content_settings.storages.DBStorage")
+if isinstance(STORAGE, str):
+    STORAGE = {
+        "backend": STORAGE,
+    }
+elif isinstance(STORAGE, dict) and "backend" not in STORAGE:
+    STORAGE = {
+        "backend": "content_settings.storages.DBStorage",
+        **STORAGE,
+    }
+
+FROZEN = get_setting("FROZEN", None)
+if FROZEN is not None:
+    STORAGE = {
+        "backend": "content_settings.storages.FrozenStorage",
+        "source": FROZEN,
+    }
+    CACHE_TRIGGER = {
+        "backend": "content_settings.cache_triggers.FrozenTrigger",
+    }
+
+READ_DB = get_setting("READ_DB", None)
+
+READ_DB_STICKY_TIMEOUT = get_setting("READ_DB_STICKY_TIMEOUT", 5)
+
+SCOPE = get_setting("SCOPE", None)
+assert SCOPE is None or (
+    isinstance(SCOPE, dict)
+    and not set(SCOPE.keys()) - {"apps", "tags", "prefixes", "names"}
+), "CONTENT_SETTINGS_SCOPE must be a dict with keys: apps, tags, prefixes, names"
+
+TO_PYTHON_MEMO_SIZE = get_setting("TO_PYTHON_MEMO_SIZE", 1000)
+
 VALUES_ONLY_FROM_DB = get_setting("VALUES_ONLY_FROM_DB", False) and not settings.DEBUG
 
 VALIDATE_DEFAULT_VALUE = get_setting("VALIDATE_DEFAULT_VALUE", settings.DEBUG)
 
+VALIDATE_DEFAULT_VALUE_CACHE_DIR = get_setting("VALIDATE_DEFAULT_VALUE_CACHE_DIR", None)
+
 DEFAULTS = get_setting("DEFAULTS", [])
 
 ADMIN_CHECKSUM_CHECK_BEFORE_SAVE = get_setting(
@@ -67,6 +106,16 @@ ADMIN_CHECKSUM_CHECK_BEFORE_SAVE = get_setting(
 
 CHAIN_VALIDATE = get_setting("CHAIN_VALIDATE", True)
 
+ADMIN_PREVIEW_CACHE_TIMEOUT = get_setting("ADMIN_PREVIEW_CACHE_TIMEOUT", 60 * 60)
+
+ADMIN_PREVIEW_CACHE_BACKEND = get_setting("ADMIN_PREVIEW_CACHE_BACKEND", "default")
+
+VALIDATION_WORKERS = get_setting("VALIDATION_WORKERS", 0)
+
+HISTORY_BATCH = get_setting("HISTORY_BATCH", False)
+
+HISTORY_WRITER = get_setting("HISTORY_WRITER", None)
+
 UI_DOC_URL = get_setting(
     "UI_DOC_URL", "https://django-content-settings.readthedocs.io/en/0.29.1/ui/"
 )
@@ -77,6 +126,8 @@ CHECK_UPDATE_HUEY = get_setting("CHECK_UPDATE_HUEY", True)
 
 USER_DEFINED_TYPES = get_setting("USER_DEFINED_TYPES", [])
 
+USER_DEFINED_LAZY_LOAD = get_setting("USER_DEFINED_LAZY_LOAD", None)
+
 assert isinstance(
     USER_DEFINED_TYPES, list
 ), "CONTENT_SETTINGS_USER_DEFINED_TYPES must be a list"
@@ -0,0 +1,560 @@
+"""
+# Storage is a backend that keeps raw values of the content settings
+
+By default raw values are stored in DB using `ContentSetting` model, but the storage can be replaced with `CONTENT_SETTINGS_STORAGE` django setting. For example for read-heavy deployments the values can be served from a local file or from memory without any DB connection.
+
+Every record returned by the storage has the same attributes as `ContentSetting` model: `name`, `value`, `version`, `tags`, `help`, `user_defined_type` and `tags_set`.
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import json
+import marshal
+import os
+import pprint
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .settings import READ_DB, READ_DB_STICKY_TIMEOUT
+
+TRecords = Dict[str, Any]  # name: record
+TChanges = Dict[
+    str, Optional[Dict[str, Any]]
+]  # name: fields to update or None to delete
+
+RECORD_FIELDS = ("value", "version", "tags", "help", "user_defined_type")
+
+ITERATOR_CHUNK_SIZE = 2000
+
+
+class StoredSetting:
+    """
+    a lightweight record of the setting for storages that do not use DB.
+    """
+
+    __slots__ = ("name",) + RECORD_FIELDS
+
+    def __init__(
+        self,
+        name: str,
+        value: str = "",
+        version: Optional[str] = None,
+        tags: Optional[str] = None,
+        help: Optional[str] = None,
+        user_defined_type: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.value = value
+        self.version = version
+        self.tags = tags
+        self.help = help
+        self.user_defined_type = user_defined_type
+
+    @property
+    def tags_set(self):
+        """
+        the same as `ContentSetting.tags_set`
+        """
+        if not self.tags:
+            return set()
+
+        return set(tag for tag in self.tags.splitlines() if tag.strip())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        the record in the same format as `export.export_to_format` uses for a single setting.
+        """
+        return {
+            key: getattr(self, key)
+            for key in RECORD_FIELDS
+            if key != "user_defined_type" or self.user_defined_type
+        }
+
+    def __repr__(self):
+        return f"<StoredSetting {self.name}>"
+
+
+def records_from_data(data: Dict[str, Any]) -> TRecords:
+    """
+    converts data in the export format (`{"settings": {name: {...}}}`) into records.
+    """
+    return {
+        name: StoredSetting(
+            name=name, **{k: v for k, v in value.items() if k in RECORD_FIELDS}
+        )
+        for name, value in data.get("settings", {}).items()
+    }
+
+
+def update_record(
+    name: str, fields: Dict[str, Any], prev: Optional[Any] = None
+) -> StoredSetting:
+    """
+    creates a new record from the previous one (if any) with updated fields.
+    """
+    cs = StoredSetting(
+        name=name,
+        **{key: fields.get(key, getattr(prev, key, None)) for key in RECORD_FIELDS},
+    )
+    if cs.value is None:
+        cs.value = ""
+    return cs
+
+
+class BaseStorage:
+    """
+    The interface of the storage backend.
+    """
+
+    def __init__(self, **params) -> None:
+        pass
+
+    def is_available(self) -> bool:
+        """
+        a cheap check if the storage can be used for loading values right now. Errors of `load_all` are not hidden.
+        """
+        return True
+
+    def load_all(self) -> TRecords:
+        """
+        load all records from the storage as a dict `name: record`.
+        """
+        raise NotImplementedError
+
+    def load(self, names: Iterable[str], prefixes: Iterable[str] = ()) -> TRecords:
+        """
+        load records only for the given names and names that start with one of the given prefixes. Names that are not in the storage are ignored.
+        """
+        names = set(names)
+        prefixes = tuple(prefixes)
+        return {
+            name: cs
+            for name, cs in self.load_all().items()
+            if name in names or name.startswith(prefixes)
+        }
+
+    def revision(self) -> str:
+        """
+        returns a string that is changed every time the stored data is changed.
+        """
+        return hashlib.md5(
+            "\n".join(
+                f"{cs.name}::{cs.value}::{cs.version or ''}::{cs.tags or ''}"
+                for cs in sorted(self.load_all().values(), key=lambda cs: cs.name)
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def load_changed_since(self, revision: str) -> Optional[TRecords]:
+        """
+        returns records that were changed after the given revision. Deleted records have None as a value.
+
+        returns None if the storage can not tell what was changed, in that case `load_all` should be used instead.
+        """
+        if revision == self.revision():
+            return {}
+        return None
+
+    def save_many(
+        self, records: TChanges, user: Any = None, set_source: bool = False
+    ) -> TRecords:
+        """
+        create, update or delete records. `records` is a dict `name: fields`, where fields is a dict of attributes to update, or None if the record should be deleted.
+
+        `user` and `set_source` are used by storages that keep the history of changes: if `set_source` is True, the change is marked as made by the user (or by the app if user is None).
+
+        returns a dict of saved records.
+        """
+        raise NotImplementedError
+
+    def written(self) -> None:
+        """
+        called when the stored data was changed by the current process outside of `save_many` (for example by saving the model directly).
+        """
+        pass
+
+
+class DBStorage(BaseStorage):
+    """
+    The default storage that uses `ContentSetting` model.
+
+    If `CONTENT_SETTINGS_READ_DB` is set, reads are made from that DB alias, except for `CONTENT_SETTINGS_READ_DB_STICKY_TIMEOUT` seconds after a write made by the current process - during that time reads are made from the primary DB, so the process always reads its own writes. Writes always go to the primary DB.
+
+    `save_many` writes all of the records in bulk with `content_settings.migrate.import_settings`.
+    """
+
+    def __init__(self, **params) -> None:
+        super().__init__(**params)
+        self.last_write: Optional[float] = None
+        self.available = False
+
+    def is_available(self) -> bool:
+        """
+        the table of `ContentSetting` can be queried (for example, it is not created before migrations). Once the table is available, it is not checked again.
+        """
+        if self.available:
+            return True
+
+        from django.db import DatabaseError
+
+        try:
+            self.get_queryset().exists()
+        except DatabaseError:
+            return False
+        self.available = True
+        return True
+
+    def written(self) -> None:
+        self.last_write = time.monotonic()
+
+    def get_read_db(self) -> Optional[str]:
+        """
+        returns DB alias for reading or None if the primary DB should be used.
+        """
+        if not READ_DB:
+            return None
+        if (
+            self.last_write is not None
+            and time.monotonic() - self.last_write < READ_DB_STICKY_TIMEOUT
+        ):
+            return None
+        return READ_DB
+
+    def get_queryset(self):
+        """
+        queryset for reading values.
+        """
+        from .models import ContentSetting
+
+        read_db = self.get_read_db()
+        if read_db is None:
+            return ContentSetting.objects.all()
+        return ContentSetting.objects.using(read_db)
+
+    def iter_records(self, queryset) -> Iterable[StoredSetting]:
+        """
+        iterate over the queryset with a single lean query that fetches only the record fields, without creating model objects.
+        """
+        for row in (
+            queryset.order_by()
+            .values_list("name", *RECORD_FIELDS)
+            .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        ):
+            yield StoredSetting(*row)
+
+    def load_all(self) -> TRecords:
+        return {cs.name: cs for cs in self.iter_records(self.get_queryset())}
+
+    def load(self, names: Iterable[str], prefixes: Iterable[str] = ()) -> TRecords:
+        from django.db.models import Q
+
+        query = Q(name__in=list(names))
+        for prefix in prefixes:
+            query |= Q(name__startswith=prefix)
+
+        return {
+            cs.name: cs for cs in self.iter_records(self.get_queryset().filter(query))
+        }
+
+    def save_many(
+        self, records: TChanges, user: Any = None, set_source: bool = False
+    ) -> TRecords:
+        from .models import ContentSetting, HistoryContentSetting
+        from .migrate import import_settings
+
+        self.written()
+        return import_settings(
+            {"settings": records},
+            model_cs=ContentSetting,
+            model_cs_history=HistoryContentSetting,
+            user=user,
+            set_source=set_source,
+        )
+
+
+class MemoryStorage(BaseStorage):
+    """
+    The storage keeps all of the values in the memory of the process.
+
+    The stored dict is never changed in place (a new dict is created on every save), so `snapshot` and `restore` work in O(1) and can be used between tests.
+
+    Arguments:
+        * data (dict, default=None): initial data in the export format (`{"settings": {...}}`)
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None) -> None:
+        self.lock = threading.Lock()
+        self.records: TRecords = records_from_data(data or {})
+        self.counter = 0
+        self.restored_on = 0
+        self.changed_on: Dict[str, int] = {}  # name: counter of the last change
+
+    def load_all(self) -> TRecords:
+        return dict(self.records)
+
+    def revision(self) -> str:
+        return str(self.counter)
+
+    def load_changed_since(self, revision: str) -> Optional[TRecords]:
+        try:
+            since = int(revision)
+        except (TypeError, ValueError):
+            return None
+
+        if since > self.counter or since < self.restored_on:
+            return None
+
+        return {
+            name: self.records.get(name)
+            for name, counter in self.changed_on.items()
+            if counter > since
+        }
+
+    def save_many(
+        self, records: TChanges, user: Any = None, set_source: bool = False
+    ) -> TRecords:
+        from .caching import recalc_checksums
+
+        saved = {}
+        with self.lock:
+            all_records = dict(self.records)
+            changed_on = dict(self.changed_on)
+            self.counter += 1
+            for name, fields in records.items():
+                changed_on[name] = self.counter
+                if fields is None:
+                    all_records.pop(name, None)
+                    continue
+
+                all_records[name] = saved[name] = update_record(
+                    name, fields, all_records.get(name)
+                )
+            self.records, self.changed_on = all_records, changed_on
+
+        recalc_checksums()
+        return saved
+
+    def snapshot(self) -> Tuple[TRecords, Dict[str, int]]:
+        """
+        returns the current state of the storage, that can be restored later by `restore`.
+        """
+        return (self.records, self.changed_on)
+
+    def restore(self, snapshot: Tuple[TRecords, Dict[str, int]]) -> None:
+        """
+        restore the state of the storage from `snapshot`.
+        """
+        with self.lock:
+            self.records, self.changed_on = snapshot
+            self.counter += 1
+            self.restored_on = self.counter
+
+
+class FileStorage(BaseStorage):
+    """
+    The storage reads values from a JSON or YAML file in the export format (the output of `content_settings_export` command).
+
+    The file is parsed again only when it was changed on the disk.
+
+    Arguments:
+        * path (str): path to the file
+        * format (str, default=None): `"json"` or `"yaml"`. If None, the format is taken from the file extension.
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None) -> None:
+        self.path = path
+        if format is None:
+            format = (
+                "yaml"
+                if os.path.splitext(path)[1].lower() in (".yml", ".yaml")
+                else "json"
+            )
+        assert format in ("json", "yaml"), f"Unknown format {format} for FileStorage"
+        self.format = format
+        self.lock = threading.Lock()
+        self.loaded: Tuple[Optional[str], TRecords] = (None, {})
+
+    def is_available(self) -> bool:
+        return os.path.exists(self.path)
+
+    def revision(self) -> str:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return ""
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def read_data(self) -> Dict[str, Any]:
+        """
+        read and parse the file
+        """
+        with open(self.path, "r", encoding="utf-8") as f:
+            if self.format == "json":
+                return json.load(f)
+
+            try:
+                import yaml
+            except ImportError:
+                raise AssertionError("Please install pyyaml package")
+            return yaml.safe_load(f) or {}
+
+    def write_data(self, data: Dict[str, Any]) -> None:
+        """
+        write data into the file. The file is replaced atomically.
+        """
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if self.format == "json":
+                json.dump(data, f, indent=2)
+            else:
+                import yaml
+
+                yaml.safe_dump(data, f, allow_unicode=True)
+        os.replace(tmp_path, self.path)
+
+    def load_all(self) -> TRecords:
+        revision = self.revision()
+        if not revision:
+            return {}
+
+        loaded_revision, records = self.loaded
+        if loaded_revision != revision:
+            records = records_from_data(self.read_data())
+            self.loaded = (revision, records)
+        return dict(records)
+
+    def save_many(
+        self, records: TChanges, user: Any = None, set_source: bool = False
+    ) -> TRecords:
+        from .caching import recalc_checksums
+
+        saved = {}
+        with self.lock:
+            all_records = self.load_all()
+            for name, fields in records.items():
+                if fields is None:
+                    all_records.pop(name, None)
+                    continue
+
+                all_records[name] = saved[name] = update_record(
+                    name, fields, all_records.get(name)
+                )
+
+            self.write_data(
+                {
+                    "settings": {
+                        name: cs.to_dict() for name, cs in sorted(all_records.items())
+                    }
+                }
+            )
+
+        recalc_checksums()
+        return saved
+
+
+def frozen_checksum(settings: Dict[str, Any]) -> str:
+    """
+    checksum of the settings data in the export format, that is saved together with frozen values.
+    """
+    return hashlib.md5(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def dump_frozen(data: Dict[str, Any], path: str) -> str:
+    """
+    save data in the export format (`{"settings": {...}}`) together with its checksum into a python module (`.py`) or a marshal file (`.marshal`). Returns the checksum.
+    """
+    settings = data.get("settings", {})
+    checksum = frozen_checksum(settings)
+
+    tmp_path = path + ".tmp"
+    if path.endswith(".py"):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("# generated by content_settings_freeze command, do not edit\n\n")
+            f.write(f"CHECKSUM = {checksum!r}\n\n")
+            f.write(f"SETTINGS = {pprint.pformat(settings, indent=4)}\n")
+    else:
+        assert path.endswith(
+            ".marshal"
+        ), "frozen file should have .py or .marshal extension"
+        with open(tmp_path, "wb") as f:
+            marshal.dump({"checksum": checksum, "settings": settings}, f)
+    os.replace(tmp_path, path)
+
+    return checksum
+
+
+def load_frozen(source: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    load checksum and settings (in the export format) from a python module or file created by `dump_frozen`.
+
+    `source` is a path to `.py` or `.marshal` file, or a dotted path of the python module.
+    """
+    if source.endswith(".marshal"):
+        with open(source, "rb") as f:
+            data = marshal.load(f)
+        checksum, settings = data["checksum"], data["settings"]
+    else:
+        if source.endswith(".py"):
+            spec = importlib.util.spec_from_file_location(
+                "content_settings_frozen", source
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        else:
+            module = importlib.import_module(source)
+        checksum, settings = module.CHECKSUM, module.SETTINGS
+
+    assert (
+        frozen_checksum(settings) == checksum
+    ), f"the checksum of frozen settings {source} is wrong"
+    return checksum, settings
+
+
+class FrozenStorage(BaseStorage):
+    """
+    The read-only storage serves values from an artifact generated by `content_settings_freeze` command. The artifact is loaded once per process, the checksum from the artifact is used as a revision.
+
+    Should be used with `content_settings.cache_triggers.FrozenTrigger`, the simplest way is to set `CONTENT_SETTINGS_FROZEN`.
+
+    Arguments:
+        * source (str): path to `.py` or `.marshal` file, or a dotted path of the python module
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.lock = threading.Lock()
+        self.loaded: Optional[Tuple[str, TRecords]] = None
+
+    def get_loaded(self) -> Tuple[str, TRecords]:
+        """
+        returns checksum and records of the artifact, the artifact is loaded on the first call
+        """
+        if self.loaded is None:
+            with self.lock:
+                if self.loaded is None:
+                    checksum, settings = load_frozen(self.source)
+                    self.loaded = (
+                        checksum,
+                        records_from_data({"settings": settings}),
+                    )
+        return self.loaded
+
+    def load_all(self) -> TRecords:
+        return dict(self.get_loaded()[1])
+
+    def load(self, names: Iterable[str], prefixes: Iterable[str] = ()) -> TRecords:
+        records = self.get_loaded()[1]
+        if prefixes:
+            return super().load(names, prefixes)
+        return {name: records[name] for name in names if name in records}
+
+    def revision(self) -> str:
+        return self.get_loaded()[0]
+
+    def save_many(
+        self, records: TChanges, user: Any = None, set_source: bool = False
+    ) -> TRecords:
+        raise AssertionError(
+            "content settings are frozen, FrozenStorage can not be changed"
+        )
@@ -0,0 +1,83 @@
+"""
+pytest fixtures for testing projects that use content settings without DB access.
+
+The values are served from `content_settings.storages.MemoryStorage` that is seeded from the default values of the code settings once per session. The storage is restored after every test in O(1).
+
+Usage in your `conftest.py`:
+
+```
+pytest_plugins = ["content_settings.testing"]
+```
+
+and in tests:
+
+```
+def test_title(content_settings_storage):
+    assert content_settings.TITLE == "Book Store"
+```
+"""
+
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+
+from .storages import MemoryStorage
+
+
+def get_default_data() -> Dict[str, Any]:
+    """
+    returns default values of all code settings (except constants) in the export format.
+    """
+    from .conf import ALL, get_str_tags
+
+    return {
+        "settings": {
+            name: {
+                "value": cs_type.default,
+                "version": cs_type.version,
+                "tags": get_str_tags(name, cs_type),
+                "help": cs_type.get_help(),
+            }
+            for name, cs_type in ALL.items()
+            if not cs_type.constant
+        }
+    }
+
+
+def reset_local_data() -> None:
+    """
+    reset the context-local storage, so values will be populated again with the next access.
+    """
+    from .caching import DATA, TRIGGER
+    from .cache_triggers import DATA as TRIGGER_DATA
+
+    DATA.POPULATED = False
+    DATA.ALL_VALUES = None
+    DATA.ALL_RAW_VALUES = None
+    DATA.ALL_USER_DEFINES = None
+
+    TRIGGER.last_checksum_from_cache = None
+    TRIGGER_DATA.ALL_VALUES_CHECKSUM = ""
+
+
+@pytest.fixture(scope="session")
+def content_settings_memory_storage() -> MemoryStorage:
+    """
+    the memory storage seeded with default values. Created once per session.
+    """
+    return MemoryStorage(data=get_default_data())
+
+
+@pytest.fixture
+def content_settings_storage(content_settings_memory_storage):
+    """
+    use the memory storage as a storage for the test. All changes made during the test are rolled back after it.
+    """
+    storage = content_settings_memory_storage
+    snapshot = storage.snapshot()
+    reset_local_data()
+    with patch("content_settings.caching.STORAGE", storage):
+        yield storage
+    storage.restore(snapshot)
+    reset_local_data()
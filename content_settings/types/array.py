@@ -12,6 +12,7 @@ from .basic import (
     PREVIEW,
 )
 from .each import EachMixin, Item
+from .mixins import FreezeMixin
 
 
 def f_empty(value: str) -> Optional[str]:
@@ -30,7 +31,7 @@ def f_comment(prefix: str) -> Callable[[str], Optional[str]]:
     return _
 
 
-class SimpleStringsList(SimpleText):
+class SimpleStringsList(FreezeMixin, SimpleText):
     """
     Split a text into a list of strings.
 
@@ -38,6 +39,7 @@ class SimpleStringsList(SimpleText):
     * filter_empty (default: True): if True, empty lines are removed
     * split_lines (default: \n): the string that separates the lines
     * filters (default: None): a list of additional filters to apply to the lines.
+    * freeze (default: False): if True, the value is converted into a tuple
     """
 
     comment_starts_with: Optional[str] = "#"
@@ -126,7 +128,7 @@ class SimpleStringsList(SimpleText):
                 yield line
 
     def to_python(self, value: str) -> List[str]:
-        return list(self.gen_to_python(value))
+        return self.freeze_python(list(self.gen_to_python(value)))
 
 
 class TypedStringsList(EachMixin, SimpleStringsList):
@@ -65,6 +65,9 @@ class SimpleString(BaseSetting):
     - `admin_head_js: Tuple[str] = ()`: list of js urls to include in the admin head
     - `admin_head_css_raw: Tuple[str] = ()`: list of css codes to include in the admin head
     - `admin_head_js_raw: Tuple[str] = ()`: list of js codes to include in the admin head
+    - `to_python_memo: bool = False`: the python object is shared between threads through the process-wide memo (`content_settings.memo`). Only for types with deterministic `to_python` and a result that is never mutated.
+    - `admin_preview_cache: bool = True`: the admin preview is cached by the value (see `CONTENT_SETTINGS_ADMIN_PREVIEW_CACHE_TIMEOUT`). Should be False if the preview or validators depend on anything besides the value and other settings.
+    - `give_memo: bool = False`: the result of `give` without suffix is memoized in the context-local storage and dropped only when the setting or any setting that was read to calculate it is changed. Useful for `DjangoTemplateNoArgs` and `SimpleEvalNoArgs` that read other settings through `CONTENT_SETTINGS`.
     """
 
     constant: bool = False
@@ -94,6 +97,9 @@ class SimpleString(BaseSetting):
     admin_head_js: Tuple[str] = ()
     admin_head_css_raw: Tuple[str] = ()
     admin_head_js_raw: Tuple[str] = ()
+    to_python_memo: bool = False
+    admin_preview_cache: bool = True
+    give_memo: bool = False
 
     def __init__(
         self, default: Optional[Union[str, required, optional]] = None, **kwargs
@@ -377,7 +383,7 @@ class SimpleString(BaseSetting):
         Full validation of the setting text value.
         """
         self.validate_raw_value(value)
-        val = self.to_python(value)
+        val = self.memo_to_python(value)
         self.validate(val)
 
     def validate(self, value: Any):
@@ -395,6 +401,17 @@ class SimpleString(BaseSetting):
         """
         return self.get_field().to_python(value)
 
+    def memo_to_python(self, value: str) -> Any:
+        """
+        The same as `to_python`, but the result is taken from the process-wide memo if `to_python_memo` is True.
+        """
+        if not self.to_python_memo:
+            return self.to_python(value)
+
+        from content_settings.memo import MEMO
+
+        return MEMO.to_python(self, value)
+
     def json_view_value(self, value: Any, **kwargs) -> Any:
         """
         Converts the setting value to JSON.
@@ -408,7 +425,7 @@ class SimpleString(BaseSetting):
         By default it uses to_python method, but it make sense to override it for some types, for example callable types,
         where you want to show the result of the call in the preview.
         """
-        return self.to_python(value)
+        return self.memo_to_python(value)
 
     def get_admin_preview_html(self, value: Any, name: str, **kwargs) -> Any:
         """
@@ -501,7 +518,7 @@ class SimpleString(BaseSetting):
         return value
 
     def give_python(self, value: str, suffix=None) -> Any:
-        return self.give(self.to_python(value), suffix)
+        return self.give(self.memo_to_python(value), suffix)
 
 
 class SimpleText(SimpleString):
@@ -4,6 +4,7 @@ EachMixin is the main mixin of the module, which allows types to have subtypes,
 For example `array.TypedStringsList`
 """
 
+from collections.abc import Mapping
 from enum import Enum, auto
 from typing import Union, Any, Dict, Optional
 
@@ -11,6 +12,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext as _
 
 from . import required, optional, PREVIEW, pre, BaseSetting
+from .mixins import FreezeMixin
 
 
 class BaseEach:
@@ -153,7 +155,7 @@ class Keys(BaseEach):
         return tuple(self.cs_types.values())
 
     def is_each(self, value):
-        return isinstance(value, dict)
+        return isinstance(value, Mapping)
 
     def each_validate(self, value):
         for k, v in value.items():
@@ -254,7 +256,7 @@ class Values(BaseEach):
         return (self.cs_type,)
 
     def is_each(self, value):
-        return isinstance(value, dict)
+        return isinstance(value, Mapping)
 
     def each_validate(self, value):
         for k, v in value.items():
@@ -344,7 +346,11 @@ class EachMixin:
         value = super().to_python(value)
         if value is None:
             return None
-        return self.process_each_to_python(value)
+        value = self.process_each_to_python(value)
+        # subvalues are converted into new structures, so the result is frozen again
+        if isinstance(self, FreezeMixin):
+            value = self.freeze_python(value)
+        return value
 
     def get_each_suffix_splitter(self):
         return self.each_suffix_splitter
@@ -10,14 +10,16 @@ from typing import List, Optional, Tuple, Dict, Union
 from content_settings.utils import remove_same_ident
 from .basic import SimpleText, PREVIEW, SimpleString
 from .each import EachMixin, Keys, Item
-from .mixins import EmptyNoneMixin
+from .mixins import EmptyNoneMixin, FreezeMixin
 from . import optional, BaseSetting, required
 
 
 # TODO: should have Empty None as well as JSON
-class SimpleYAML(SimpleText):
+class SimpleYAML(FreezeMixin, SimpleText):
     """
     YAML content settings type. Requires yaml module.
+
+    * freeze (default: False): if True, the value is converted into immutable structures
     """
 
     admin_preview_as: PREVIEW = PREVIEW.PYTHON
@@ -56,14 +58,16 @@ class SimpleYAML(SimpleText):
         from yaml import load
 
         try:
-            return load(value, Loader=self.get_yaml_loader())
+            return self.freeze_python(load(value, Loader=self.get_yaml_loader()))
         except Exception as e:
             raise ValidationError(str(e))
 
 
-class SimpleJSON(EmptyNoneMixin, SimpleText):
+class SimpleJSON(FreezeMixin, EmptyNoneMixin, SimpleText):
     """
     JSON content settings type.
+
+    * freeze (default: False): if True, the value is converted into immutable structures
     """
 
     admin_preview_as: PREVIEW = PREVIEW.PYTHON
@@ -84,7 +88,7 @@ class SimpleJSON(EmptyNoneMixin, SimpleText):
         from json import loads
 
         try:
-            return loads(value, cls=self.get_decoder_cls())
+            return self.freeze_python(loads(value, cls=self.get_decoder_cls()))
         except Exception as e:
             raise ValidationError(str(e))
 
@@ -8,7 +8,7 @@ from django.utils.translation import gettext as _
 
 from .validators import call_validator, PreviewValidator, PreviewValidationError
 from . import PREVIEW, pre, TCallableStr
-from ..utils import call_base_str
+from ..utils import call_base_str, freeze_value, unfreeze_value
 
 TNumber = Union[int, float, Decimal]
 
@@ -150,6 +150,26 @@ class EmptyNoneMixin:
         super().validate_value(value)
 
 
+class FreezeMixin:
+    """
+    Mixin that adds `freeze` attribute. If `freeze` is True, the py object is converted into immutable structures (tuple, frozenset, read-only MappingProxyType) at parse time, so one copy can be safely shared between threads and contexts.
+
+    The type should call `freeze_python` for the result of `to_python`. `EachMixin` freezes the value again after subvalues are converted.
+    """
+
+    freeze: bool = False
+
+    def freeze_python(self, value: Any) -> Any:
+        if not self.freeze:
+            return value
+        return freeze_value(value)
+
+    def json_view_value(self, value: Any, **kwargs) -> Any:
+        if self.freeze:
+            value = unfreeze_value(value)
+        return super().json_view_value(value, **kwargs)
+
+
 class HTMLMixin:
     """
     Mixin for types that should be displayed in HTML format.
@@ -180,6 +200,7 @@ class CallToPythonMixin:
     Mixin for callable types, or types that should be called to get the value.
     """
 
+    admin_preview_cache: bool = False
     call_func_argument_name: str = "prepared"
     call_func: TCallableStr = staticmethod(
         lambda *args, prepared=None, **kwargs: prepared(*args, **kwargs)
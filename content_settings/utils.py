@@ -126,3 +126,33 @@ def call_base_str(func: TCallableStr, *args, call_base: Any = None, **kwargs) ->
         kwargs["call_base"] = call_base
 
     return func(*args, **kwargs)
+
+
+def freeze_value(value: Any) -> Any:
+    """
+    convert the value into immutable structures recursively: dict into read-only `MappingProxyType`, list and tuple into tuple, set into frozenset. Other values are returned as is.
+    """
+    from types import MappingProxyType
+
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze_value(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+def unfreeze_value(value: Any) -> Any:
+    """
+    the opposite of `freeze_value`: convert immutable structures back into dict, list and set.
+    """
+    from types import MappingProxyType
+
+    if isinstance(value, MappingProxyType):
+        return {k: unfreeze_value(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [unfreeze_value(v) for v in value]
+    if isinstance(value, frozenset):
+        return set(value)
+    return value
@@ -121,6 +121,10 @@ def do_reset_all_values():
 
     TRIGGER_DATA.ALL_VALUES_CHECKSUM = ""
 
+    from content_settings.preview import clear as clear_previews
+
+    clear_previews()
+
 
 @pytest.fixture
 def testadmin():
@@ -267,6 +267,55 @@ def test_preview_validation_error(webtest_admin):
     assert resp.json == {"error": "['Enter a whole number.']"}
 
 
+def test_preview_cached(webtest_admin):
+    from unittest.mock import patch
+    from content_settings.types.datetime import DateString
+
+    cache.clear()
+
+    def preview(value):
+        return webtest_admin.post(
+            "/admin/content_settings/contentsetting/preview/",
+            {"name": "OPEN_DATE", "value": value},
+        ).json
+
+    with patch.object(
+        DateString,
+        "get_full_admin_preview_value",
+        autospec=True,
+        side_effect=DateString.get_full_admin_preview_value,
+    ) as get_preview:
+        assert preview("2023-01-02") == {"html": "<pre>datetime.date(2023, 1, 2)</pre>"}
+        assert preview("2023-01-02") == {"html": "<pre>datetime.date(2023, 1, 2)</pre>"}
+        assert get_preview.call_count == 1
+
+        assert preview("2023-01-03") == {"html": "<pre>datetime.date(2023, 1, 3)</pre>"}
+        assert get_preview.call_count == 2
+
+
+def test_preview_cached_per_user(webtest_admin, webtest_staff):
+    from unittest.mock import patch
+    from content_settings.types.datetime import DateString
+
+    cache.clear()
+
+    def preview(web):
+        return web.post(
+            "/admin/content_settings/contentsetting/preview/",
+            {"name": "OPEN_DATE", "value": "2023-01-02"},
+        ).json
+
+    with patch.object(
+        DateString,
+        "get_full_admin_preview_value",
+        autospec=True,
+        side_effect=lambda self, value, name, user=None: {"html": user.username},
+    ):
+        assert preview(webtest_admin) == {"html": "testadmin"}
+        assert preview(webtest_staff) == {"html": "teststaff"}
+        assert preview(webtest_admin) == {"html": "testadmin"}
+
+
 def test_add_tag(webtest_admin):
     cs = ContentSetting.objects.get(name="TITLE")
     resp = webtest_admin.post(
@@ -299,6 +348,41 @@ def test_add_tag(webtest_admin):
     assert len(resp.html.find("table", {"id": "result_list"}).findAll("tr")) == 2
 
 
+def test_filter_by_tag(webtest_admin):
+    from content_settings.models import ContentSettingTag
+
+    assert set(
+        ContentSettingTag.objects.filter(name="TITLE").values_list("tag", flat=True)
+    ) == ContentSetting.objects.get(name="TITLE").tags_set
+
+    resp = webtest_admin.get("/admin/content_settings/contentsetting/?tags=general")
+    assert resp.status_int == 200
+    assert len(resp.html.find("table", {"id": "result_list"}).findAll("tr")) == 3
+
+    resp = webtest_admin.get("/admin/content_settings/contentsetting/context-tags/")
+    assert resp.status_int == 200
+    assert '<a href="?tags=general">general</a><sup>2</sup>' in resp.content.decode(
+        "utf-8"
+    )
+
+    ContentSetting.objects.get(name="TITLE").delete()
+    assert not ContentSettingTag.objects.filter(name="TITLE").exists()
+
+
+def test_context_tags_same_tag_in_user_tags(webtest_admin):
+    UserTagSetting.objects.create(
+        name="TITLE",
+        tag="general",
+        user=get_user_model().objects.get(username="testadmin"),
+    )
+
+    resp = webtest_admin.get("/admin/content_settings/contentsetting/context-tags/")
+    assert resp.status_int == 200
+    assert '<a href="?tags=general">general</a><sup>2</sup>' in resp.content.decode(
+        "utf-8"
+    )
+
+
 def test_remove_tag(webtest_admin):
     initial_total_tags = UserTagSetting.objects.all().count()
 
@@ -406,6 +490,24 @@ def test_view_permission_staff_for_awesome_staff_abs_url(webtest_staff):
     assert resp.status_int == 403
 
 
+def test_hidden_names_once_per_permission(rf, teststaff):
+    from unittest.mock import patch
+    from content_settings.admin import get_hidden_names
+
+    request = rf.get("/admin/content_settings/contentsetting/")
+    request.user = teststaff
+
+    with patch(
+        "content_settings.permissions.staff", wraps=lambda user: True
+    ) as staff_permission:
+        hidden_names = get_hidden_names(request)
+        assert get_hidden_names(request) is hidden_names
+
+    assert staff_permission.call_count == 1
+    assert "AWESOME_PASS" in hidden_names
+    assert "REFFERAL_URL" not in hidden_names
+
+
 def test_view_permission_superuser_for_awesome_staff(webtest_admin):
     resp = webtest_admin.get("/admin/content_settings/contentsetting/")
     assert resp.status_int == 200
@@ -446,6 +548,65 @@ def test_admin_preview_on_site(webtest_admin, webtest_user, testadmin):
     assert resp.html.find("title").text == "Book Store"
 
 
+@pytest.mark.skipif(
+    testing_settings_min, reason="skipping because of testing_settings_min"
+)
+def test_admin_preview_on_site_cached(webtest_admin, testadmin):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from content_settings.preview import get_preview
+
+    us = UserPreview.objects.create(
+        user=testadmin,
+        name="TITLE",
+        from_value="Book Store",
+        value="New Title",
+    )
+
+    resp = webtest_admin.get("/books/")
+    assert resp.html.find("title").text == "New Title"
+    assert get_preview(testadmin)[1] == {"TITLE": "New Title"}
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = webtest_admin.get("/books/")
+    assert resp.html.find("title").text == "New Title"
+    assert not [
+        q
+        for q in ctx.captured_queries
+        if "userpreview" in q["sql"] or "permission" in q["sql"]
+    ]
+
+    us.value = "Newer Title"
+    us.save()
+
+    resp = webtest_admin.get("/books/")
+    assert resp.html.find("title").text == "Newer Title"
+
+
+@pytest.mark.skipif(
+    testing_settings_min, reason="skipping because of testing_settings_min"
+)
+def test_admin_preview_on_site_cached_permission_revoked(webtest_staff, teststaff):
+    from django.contrib.auth.models import Permission
+
+    perm = Permission.objects.get(codename="can_preview_on_site")
+    teststaff.user_permissions.add(perm)
+    UserPreview.objects.create(
+        user=teststaff,
+        name="TITLE",
+        from_value="Book Store",
+        value="New Title",
+    )
+
+    resp = webtest_staff.get("/books/")
+    assert resp.html.find("title").text == "New Title"
+
+    teststaff.user_permissions.remove(perm)
+
+    resp = webtest_staff.get("/books/")
+    assert resp.html.find("title").text == "Book Store"
+
+
 @pytest.mark.skipif(
     testing_settings_min, reason="skipping because of testing_settings_min"
 )
@@ -1045,3 +1206,37 @@ def test_admin_space_in_the_beginning_of_value(webtest_admin):
 
     cs.refresh_from_db()
     assert cs.value == " New Title"
+
+
+def test_admin_export_as_json(webtest_admin):
+    import json
+
+    cs = ContentSetting.objects.get(name="TITLE")
+    resp = webtest_admin.get("/admin/content_settings/contentsetting/")
+    form = resp.forms["changelist-form"]
+    form["action"] = "export_as_json"
+    for checkbox in form.fields["_selected_action"]:
+        if checkbox._value == str(cs.id):
+            checkbox.checked = True
+    resp = form.submit()
+    assert resp.status_int == 200
+    assert "attachment" in resp.headers["Content-Disposition"]
+    assert json.loads(resp.body) == {
+        "settings": {"TITLE": {"value": "Book Store", "version": ""}}
+    }
+
+
+def test_admin_export_as_json_skips_removed_setting(rf, testadmin):
+    import json
+    from django.contrib.admin import site
+
+    ContentSetting.objects.create(name="REMOVED_SETTING", value="1")
+    request = rf.get("/admin/content_settings/contentsetting/")
+    request.user = testadmin
+
+    response = site._registry[ContentSetting].export_as_json(
+        request, ContentSetting.objects.filter(name__in=["TITLE", "REMOVED_SETTING"])
+    )
+    assert json.loads(b"".join(response.streaming_content)) == {
+        "settings": {"TITLE": {"value": "Book Store", "version": ""}}
+    }
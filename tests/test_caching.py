@@ -5,9 +5,9 @@ from django.test import Client
 from django.core.cache import cache
 
 from content_settings.models import ContentSetting
-from content_settings.caching import TRIGGER, validate_default_values
+from content_settings.caching import TRIGGER, validate_default_values, populate
 
-from . import testing_precached_py_values
+from . import testing_precached_py_values, testing_settings_min
 
 pytestmark = [pytest.mark.django_db(transaction=True)]
 
@@ -213,3 +213,262 @@ def test_validate_default_values_do_not_trigger_db_access():
     with patch("content_settings.caching.get_db_objects") as mock_get_db_objects:
         validate_default_values()
         assert mock_get_db_objects.call_count == 0
+
+
+def test_validate_default_values_once():
+    from content_settings.caching import validate_default_values_once
+
+    with patch("content_settings.caching.DEFAULT_VALUES_VALIDATED", None), patch(
+        "content_settings.caching.validate_default_values"
+    ) as mock_validate:
+        assert validate_default_values_once()
+        assert not validate_default_values_once()
+        assert mock_validate.call_count == 1
+
+
+def test_validate_default_values_once_cached_on_disk(tmp_path):
+    from content_settings.caching import (
+        validate_default_values_once,
+        get_default_values_digest,
+    )
+
+    with patch("content_settings.caching.DEFAULT_VALUES_VALIDATED", None), patch(
+        "content_settings.caching.VALIDATE_DEFAULT_VALUE_CACHE_DIR", str(tmp_path)
+    ), patch("content_settings.caching.validate_default_values") as mock_validate:
+        assert validate_default_values_once()
+        assert (
+            tmp_path / f"content_settings_defaults_{get_default_values_digest()}.ok"
+        ).exists()
+
+    with patch("content_settings.caching.DEFAULT_VALUES_VALIDATED", None), patch(
+        "content_settings.caching.VALIDATE_DEFAULT_VALUE_CACHE_DIR", str(tmp_path)
+    ), patch("content_settings.caching.validate_default_values") as mock_validate:
+        assert not validate_default_values_once()
+        assert mock_validate.call_count == 0
+
+
+def test_default_values_digest_depends_on_version():
+    from content_settings.caching import get_default_values_digest
+    from content_settings.conf import ALL
+
+    digest = get_default_values_digest()
+    assert digest == get_default_values_digest()
+
+    with patch.object(ALL["TITLE"], "version", "changed"):
+        assert digest != get_default_values_digest()
+
+
+def test_populate_makes_single_query(django_assert_num_queries):
+    """
+    populate loads all values and calculates the checksum with a single query (after the storage is checked for availability)
+    """
+    from content_settings.caching import STORAGE
+
+    with patch.object(STORAGE, "is_available", return_value=True):
+        with django_assert_num_queries(1):
+            populate()
+
+
+@pytest.fixture
+def scope():
+    from content_settings.caching import set_scope, reset_scope
+
+    yield set_scope
+    reset_scope()
+
+
+def test_scope_by_tag(scope):
+    from content_settings.conf import content_settings
+
+    scope(tags=["general"])
+    assert content_settings.TITLE == "Book Store"
+    assert "BOOKS_ON_HOME_PAGE" not in dir(content_settings)
+
+
+def test_scope_loads_only_scoped_names(scope):
+    from content_settings.caching import get_db_objects
+
+    scope(prefixes=["IS_"], names=["TITLE"])
+    assert set(get_db_objects()) == {
+        "TITLE",
+        "IS_OPEN",
+        "IS_OPEN_VALIDATED",
+        "IS_CLOSED",
+    }
+
+
+def test_scope_out_of_scope_error(scope):
+    from content_settings.conf import content_settings
+    from content_settings.caching import OutOfScopeError
+
+    scope(names=["TITLE"])
+    with pytest.raises(OutOfScopeError):
+        content_settings.BOOKS_ON_HOME_PAGE
+
+
+def test_scope_out_of_scope_error_raw_value(scope):
+    from content_settings.caching import OutOfScopeError, get_raw_value
+
+    scope(names=["TITLE"])
+    assert get_raw_value("TITLE") == "Book Store"
+    with pytest.raises(OutOfScopeError):
+        get_raw_value("BOOKS_ON_HOME_PAGE")
+
+
+def test_scope_validate_default_values(scope):
+    from content_settings.conf import content_settings
+    from content_settings.caching import OutOfScopeError
+
+    scope(names=["TITLE"])
+    validate_default_values()
+    assert content_settings.TITLE == "Book Store"
+    with pytest.raises(OutOfScopeError):
+        content_settings.BOOKS_ON_HOME_PAGE
+
+
+def test_scope_by_app(scope):
+    from content_settings.conf import content_settings
+    from content_settings.caching import get_scope_names
+
+    scope(apps=["tests.books"])
+    assert "BOOKS_ON_HOME_PAGE" in get_scope_names()
+    assert content_settings.BOOKS_ON_HOME_PAGE == 3
+
+
+@pytest.fixture
+def chain_dependencies():
+    from content_settings.conf import CHAIN_DEPENDENCIES
+
+    CHAIN_DEPENDENCIES.clear()
+    yield CHAIN_DEPENDENCIES
+    CHAIN_DEPENDENCIES.clear()
+
+
+@pytest.mark.skipif(
+    testing_settings_min, reason="skipping because of testing_settings_min"
+)
+def test_chain_validate_records_dependencies(chain_dependencies):
+    from content_settings.conf import validate_all_with_context, get_chain_dependents
+
+    validate_all_with_context({})
+
+    assert set(chain_dependencies["XSHOT_CALCULATION"]) == {
+        "XSHOT_CALCULATION",
+        "YARCHER_DEVIDER",
+        "XARCHER_DEVIDER",
+    }
+    assert get_chain_dependents({"XARCHER_DEVIDER"}) == {
+        "XSHOT_CALCULATION",
+        "YARCHER_DEVIDER",
+    }
+
+
+@pytest.mark.skipif(
+    testing_settings_min, reason="skipping because of testing_settings_min"
+)
+def test_chain_validate_only_dependents(chain_dependencies):
+    from django.core.exceptions import ValidationError
+    from content_settings.conf import validate_all_with_context, ALL
+
+    validate_all_with_context({})
+
+    with patch.object(
+        ALL["XSHOT_CALCULATION"], "validate", wraps=ALL["XSHOT_CALCULATION"].validate
+    ) as validate:
+        validate_all_with_context({"TITLE": "New Title"})
+        assert validate.call_count == 0
+
+        validate_all_with_context({"XARCHER_DEVIDER": "5"})
+        assert validate.call_count == 1
+
+        with pytest.raises(ValidationError):
+            validate_all_with_context({"XARCHER_DEVIDER": "0"})
+        assert validate.call_count == 2
+
+
+def test_give_memo_invalidated_by_dependency():
+    from content_settings.conf import ALL, content_settings
+    from content_settings.caching import DATA
+    from content_settings.context_managers import content_settings_context
+    from content_settings.types.template import DjangoTemplateNoArgs
+
+    cs_type = DjangoTemplateNoArgs(give_memo=True)
+    with patch.dict(ALL, {"DERIVED_TITLE": cs_type}), content_settings_context(
+        DERIVED_TITLE="{{CONTENT_SETTINGS.TITLE}}!"
+    ), patch.object(cs_type, "give", wraps=cs_type.give) as give:
+        assert content_settings.DERIVED_TITLE == "Book Store!"
+        assert content_settings.DERIVED_TITLE == "Book Store!"
+        assert give.call_count == 1
+        assert DATA.DERIVED_READS["DERIVED_TITLE"] == {"DERIVED_TITLE", "TITLE"}
+
+        with content_settings_context(BOOKS_ON_HOME_PAGE="5"):
+            assert content_settings.DERIVED_TITLE == "Book Store!"
+            assert give.call_count == 1
+
+        with content_settings_context(TITLE="New"):
+            assert content_settings.DERIVED_TITLE == "New!"
+            assert give.call_count == 2
+
+        assert content_settings.DERIVED_TITLE == "Book Store!"
+        assert give.call_count == 3
+
+
+@pytest.fixture
+def validation_workers():
+    with patch("content_settings.caching.VALIDATION_WORKERS", 3):
+        yield
+
+
+def test_map_in_context_keeps_order(validation_workers):
+    from content_settings.caching import map_in_context, get_value
+
+    results = map_in_context(lambda value: 10 // value, [1, 2, 0, 5, 0])
+    assert [result for result, _ in results] == [10, 5, None, 2, None]
+    assert [type(error) for _, error in results] == [
+        type(None),
+        type(None),
+        ZeroDivisionError,
+        type(None),
+        ZeroDivisionError,
+    ]
+
+    results = map_in_context(
+        lambda name: get_value(name), ["TITLE"] * 4, context={"TITLE": "New Title"}
+    )
+    assert results == [("New Title", None)] * 4
+
+
+@pytest.mark.skipif(
+    testing_settings_min, reason="skipping because of testing_settings_min"
+)
+def test_chain_validate_in_threads(validation_workers, chain_dependencies):
+    from django.core.exceptions import ValidationError
+    from content_settings.conf import validate_all_with_context
+
+    validate_all_with_context({"XARCHER_DEVIDER": "5"})
+    assert "XSHOT_CALCULATION" in chain_dependencies
+
+    with pytest.raises(ValidationError) as error:
+        validate_all_with_context({"XARCHER_DEVIDER": "0"})
+    assert "Error validating XSHOT_CALCULATION" in str(error.value)
+
+
+def test_validate_default_values_in_threads(validation_workers):
+    validate_default_values()
+
+
+def test_preview_data_in_threads(validation_workers):
+    from content_settings.export import preview_data
+
+    errors, applied, skipped = preview_data(
+        {
+            "settings": {
+                "TITLE": {"value": "New Title", "version": ""},
+                "UNKNOWN": {"value": "1", "version": ""},
+                "BOOKS_ON_HOME_PAGE": {"value": "3", "version": ""},
+            }
+        }
+    )
+    assert errors == [{"name": "UNKNOWN", "reason": "Setting does not exist"}]
+    assert [row["name"] for row in applied] == ["TITLE"]
+    assert [row["name"] for row in skipped] == ["BOOKS_ON_HOME_PAGE"]
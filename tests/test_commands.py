@@ -193,3 +193,175 @@ def test_import_two_setting_one_confirmed():
     assert "Applied" in out
     assert ContentSetting.objects.get(name="TITLE").value == "The New Book Store"
     assert ContentSetting.objects.get(name="BOOKS_ON_HOME_PAGE").value == "3"
+
+
+@pytest.mark.parametrize("ext", ["py", "marshal"])
+def test_freeze(tmp_path, ext):
+    from content_settings.storages import load_frozen
+
+    path = str(tmp_path / f"frozen.{ext}")
+    out, err = std_command("content_settings_freeze", path, "--names", "TITLE")
+    assert not err
+    assert "1 settings are frozen" in out
+
+    checksum, settings = load_frozen(path)
+    assert checksum in out
+    assert settings == {"TITLE": {"value": "Book Store", "version": ""}}
+
+
+def test_import_timing():
+    out, err = std_import(
+        {
+            "settings": {
+                "TITLE": {"value": "The New Book Store", "version": ""},
+            }
+        },
+    )
+    assert not err
+    assert "Timing: load " in out
+    assert "diff " in out
+    assert "validate " in out
+
+
+def test_import_preview_single_query(django_assert_num_queries):
+    from content_settings.export import preview_data
+
+    with django_assert_num_queries(1):
+        errors, applied, skipped = preview_data(
+            {
+                "settings": {
+                    "TITLE": {"value": "The New Book Store", "version": ""},
+                    "BOOKS_ON_HOME_PAGE": {"value": "3", "version": ""},
+                    "UNKNOWN": {"value": "3", "version": ""},
+                }
+            }
+        )
+    assert [row["name"] for row in applied] == ["TITLE"]
+    assert [row["name"] for row in skipped] == ["BOOKS_ON_HOME_PAGE"]
+    assert [row["name"] for row in errors] == ["UNKNOWN"]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 65536])
+def test_iter_import_settings(chunk_size):
+    from content_settings.export import iter_import_settings
+
+    data = {
+        "version": 12345,
+        "settings": {
+            "TITLE": {"value": 'The New "Book" Store', "version": ""},
+            "BOOKS_ON_HOME_PAGE": {"value": "4", "version": ""},
+            "REMOVED": None,
+        },
+        "extra": [1, {"a": True}],
+    }
+    assert list(iter_import_settings(StringIO(json.dumps(data)), chunk_size)) == list(
+        data["settings"].items()
+    )
+
+
+def test_iter_import_settings_every_chunk_size():
+    from content_settings.export import iter_import_settings
+
+    raw = json.dumps(
+        {
+            "exported_at": 1700000000.25,
+            "settings": {
+                "TITLE": {"value": "Book Store", "version": ""},
+                "WEIGHT": {"value": "1", "number": -12.5e-3, "flag": False},
+                "PRICE": {"value": "2", "number": 1e10, "empty": None},
+                "NAME": {"value": 'Caf\u00e9 \\ "Book"', "flag": True},
+                "LIMIT": {"value": "3", "number": float("-inf")},
+            },
+            "count": 3,
+        }
+    )
+    expected = list(json.loads(raw)["settings"].items())
+    for chunk_size in range(1, len(raw) + 1):
+        assert list(iter_import_settings(StringIO(raw), chunk_size)) == expected
+
+
+def test_iter_import_settings_wrong_format():
+    from content_settings.export import iter_import_settings, Error
+
+    with pytest.raises(Error):
+        list(iter_import_settings(StringIO(json.dumps({"bla": {}}))))
+
+    with pytest.raises(Error):
+        list(iter_import_settings(StringIO('{"settings": {"TITLE": {"val')))
+
+
+def test_iter_import_settings_malformed_is_not_read_to_the_end():
+    from content_settings.export import iter_import_settings, Error
+
+    fp = StringIO('{"settings": {"TITLE": {"value": trux}}' + " " * 100000 + "}")
+    with pytest.raises(Error):
+        list(iter_import_settings(fp, 16))
+    assert fp.tell() < 1000
+
+
+def test_import_stream():
+    out, err = std_import(
+        {
+            "settings": {
+                "TITLE": {"value": "The New Book Store", "version": "2"},
+                "BOOKS_ON_HOME_PAGE": {"value": "4", "version": ""},
+                "XARCHER_DEVIDER": {"value": "10", "version": ""},
+            }
+        },
+        "--stream",
+        "--import",
+        "--chunk-size",
+        "2",
+    )
+    assert not err
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [(row["status"], row.get("name")) for row in rows] == [
+        ("error", "TITLE"),
+        ("applied", "BOOKS_ON_HOME_PAGE"),
+        ("summary", None),
+    ]
+    assert rows[-1]["applied"] == 1
+    assert rows[-1]["skipped"] == 1
+    assert ContentSetting.objects.get(name="BOOKS_ON_HOME_PAGE").value == "4"
+
+
+@pytest.mark.parametrize("count", [0, 1, None])
+def test_iter_export_formats(count):
+    from content_settings.export import iter_export, export_to_data
+
+    ContentSetting.objects.create(
+        name="PREFIX", value='a\n"b"', user_defined_type="line", tags="a\nb"
+    )
+    content_settings = ContentSetting.objects.all()[:count]
+    data = export_to_data(content_settings)
+
+    assert "".join(iter_export(content_settings)) == json.dumps(data, indent=2)
+    assert json.loads("".join(iter_export(content_settings, "compact"))) == data
+
+    rows = [
+        json.loads(line)
+        for line in "".join(iter_export(content_settings, "ndjson")).splitlines()
+    ]
+    assert {row.pop("name"): row for row in rows} == data["settings"]
+
+
+def test_export_ndjson():
+    out, err = std_command(
+        "content_settings_export", "--names", "TITLE", "--format", "ndjson"
+    )
+    assert not err
+    assert json.loads(out) == {"name": "TITLE", "value": "Book Store", "version": ""}
+
+
+def test_export_output_gzip(tmp_path):
+    import gzip
+
+    path = tmp_path / "export.json.gz"
+    out, err = std_command(
+        "content_settings_export", "--names", "TITLE", "--output", str(path)
+    )
+    assert not out
+    with gzip.open(path, "rt") as fh:
+        assert json.load(fh)["settings"] == {
+            "TITLE": {"value": "Book Store", "version": ""}
+        }
@@ -0,0 +1,315 @@
+import pytest
+from unittest.mock import patch, Mock
+
+from django.db import transaction
+
+from content_settings.models import ContentSetting, HistoryContentSetting
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def history_batch():
+    with patch("content_settings.history.HISTORY_BATCH", True):
+        yield
+
+
+def save_value(name, value):
+    cs = ContentSetting.objects.get(name=name)
+    cs.value = value
+    cs.save()
+
+
+def test_batch_written_on_commit(history_batch):
+    count = HistoryContentSetting.objects.count()
+
+    with transaction.atomic():
+        save_value("TITLE", "New Title")
+        save_value("BOOKS_ON_HOME_PAGE", "4")
+        assert HistoryContentSetting.objects.count() == count
+
+    assert HistoryContentSetting.objects.count() == count + 2
+    assert HistoryContentSetting.objects.filter(name="TITLE").first().value == (
+        "New Title"
+    )
+
+
+def test_batch_source_of_pending_record(history_batch, testadmin):
+    with transaction.atomic():
+        save_value("TITLE", "New Title")
+        HistoryContentSetting.update_last_record_for_name("TITLE", testadmin)
+
+    record = HistoryContentSetting.objects.filter(name="TITLE").first()
+    assert record.value == "New Title"
+    assert record.by_user
+    assert record.user == testadmin
+
+
+def test_batch_rollback(history_batch):
+    count = HistoryContentSetting.objects.count()
+
+    with pytest.raises(ValueError):
+        with transaction.atomic():
+            save_value("TITLE", "New Title")
+            raise ValueError
+
+    with transaction.atomic():
+        save_value("BOOKS_ON_HOME_PAGE", "4")
+
+    assert HistoryContentSetting.objects.count() == count + 1
+    assert not HistoryContentSetting.objects.filter(value="New Title").exists()
+
+
+def test_batch_nested_rollback(history_batch):
+    count = HistoryContentSetting.objects.count()
+
+    with transaction.atomic():
+        save_value("TITLE", "New Title")
+        with pytest.raises(ValueError):
+            with transaction.atomic():
+                save_value("BOOKS_ON_HOME_PAGE", "77")
+                raise ValueError
+        with transaction.atomic():
+            save_value("BOOKS_ON_HOME_PAGE", "4")
+        HistoryContentSetting.update_last_record_for_name("BOOKS_ON_HOME_PAGE", None)
+
+    assert HistoryContentSetting.objects.count() == count + 2
+    assert not HistoryContentSetting.objects.filter(value="77").exists()
+    assert ContentSetting.objects.get(name="BOOKS_ON_HOME_PAGE").value == "4"
+    assert (
+        HistoryContentSetting.objects.filter(name="BOOKS_ON_HOME_PAGE").first().by_user
+        is False
+    )
+
+
+def test_batch_nested_release_order(history_batch):
+    with transaction.atomic():
+        save_value("BOOKS_ON_HOME_PAGE", "1")
+        with transaction.atomic():
+            save_value("BOOKS_ON_HOME_PAGE", "2")
+        save_value("BOOKS_ON_HOME_PAGE", "3")
+        HistoryContentSetting.update_last_record_for_name("BOOKS_ON_HOME_PAGE", None)
+        with transaction.atomic():
+            with transaction.atomic():
+                save_value("BOOKS_ON_HOME_PAGE", "4")
+        save_value("TITLE", "New Title")
+
+    records = HistoryContentSetting.objects.filter(name="BOOKS_ON_HOME_PAGE")
+    assert list(records.order_by("-id").values_list("value", "by_user")[:4]) == [
+        ("4", None),
+        ("3", False),
+        ("2", None),
+        ("1", None),
+    ]
+
+
+def test_batch_writer(history_batch):
+    writer = Mock()
+
+    with patch("content_settings.history.HISTORY_WRITER", writer):
+        with transaction.atomic():
+            save_value("TITLE", "New Title")
+            save_value("BOOKS_ON_HOME_PAGE", "4")
+
+    assert writer.call_count == 1
+    (records,), _ = writer.call_args
+    assert [record.name for record in records] == ["TITLE", "BOOKS_ON_HOME_PAGE"]
+
+
+def test_batch_outside_of_transaction(history_batch):
+    save_value("TITLE", "New Title")
+
+    assert HistoryContentSetting.objects.filter(name="TITLE").first().value == (
+        "New Title"
+    )
+
+
+def create_history(name, values, **kwargs):
+    return [
+        HistoryContentSetting.objects.create(name=name, value=value, **kwargs)
+        for value in values
+    ]
+
+
+def test_with_previous():
+    records = create_history("XNAME", ["a", "b"])
+
+    rows = HistoryContentSetting.with_previous(
+        HistoryContentSetting.objects.filter(name="XNAME")
+    ).order_by("id")
+    assert [(row.id, row.previous_id, row.previous_value) for row in rows] == [
+        (records[0].id, None, None),
+        (records[1].id, records[0].id, "a"),
+    ]
+
+
+def test_duplicate_ids_as_unique_records():
+    from content_settings.history import iter_duplicate_ids
+
+    records = create_history("XNAME", ["a", "a", "b", "b", "b", "a"])
+    create_history("YNAME", ["a"])
+
+    duplicate_ids = set(iter_duplicate_ids())
+    assert {r.id for r in records} - duplicate_ids == {
+        r.id for r in HistoryContentSetting.gen_unique_records("XNAME")
+    }
+    assert duplicate_ids & {r.id for r in records} == {
+        records[1].id,
+        records[3].id,
+        records[4].id,
+    }
+
+
+@pytest.mark.parametrize(
+    "supports_over_clause, version",
+    [(True, (5, 0)), (True, (4, 1)), (False, (5, 0))],
+)
+def test_duplicate_ids_in_db(supports_over_clause, version):
+    import django
+    from django.db import connection
+    from content_settings.history import iter_duplicate_ids
+
+    records = create_history("XNAME", ["a", "a", "a", "b"])
+    records += create_history("XNAME", ["b"], tags="one")
+    records += create_history("XNAME", ["b", "b"], tags="one")
+
+    with patch.object(
+        connection.features, "supports_over_clause", supports_over_clause
+    ), patch.object(django, "VERSION", version):
+        assert set(iter_duplicate_ids()) & {r.id for r in records} == {
+            records[1].id,
+            records[2].id,
+            records[5].id,
+        }
+
+
+def test_compact_by_chunks():
+    from content_settings.history import compact
+
+    records = create_history("XNAME", ["a", "a", "a", "a", "b", "b", "c"])
+
+    assert compact(chunk_size=2) == (4, 0)
+    assert list(
+        HistoryContentSetting.objects.filter(name="XNAME")
+        .order_by("id")
+        .values_list("id", flat=True)
+    ) == [records[0].id, records[4].id, records[6].id]
+
+
+def test_retention_ids():
+    from datetime import timedelta
+    from django.utils import timezone
+    from content_settings.history import iter_retention_ids
+
+    old = create_history(
+        "XNAME", ["a", "b"], created_on=timezone.now() - timedelta(days=10)
+    )
+    new = create_history("XNAME", ["c", "d", "e"])
+    only_old = create_history(
+        "YNAME", ["a"], created_on=timezone.now() - timedelta(days=10)
+    )
+
+    assert set(iter_retention_ids(max_age=5)) >= {old[0].id, old[1].id}
+    assert only_old[0].id not in set(iter_retention_ids(max_age=5))
+    assert set(iter_retention_ids(max_count=2)) >= {old[0].id, old[1].id, new[0].id}
+    assert not {new[1].id, new[2].id} & set(iter_retention_ids(max_count=2))
+
+
+def test_history_compact_command(tmp_path):
+    import gzip
+    import json
+    from io import StringIO
+    from django.core.management import call_command
+
+    records = create_history("XNAME", ["a", "a", "b", "c"])
+    archive = tmp_path / "history.ndjson.gz"
+
+    out = StringIO()
+    call_command(
+        "content_settings_history_compact",
+        "--max-count",
+        "2",
+        "--archive",
+        str(archive),
+        stdout=out,
+    )
+
+    assert list(
+        HistoryContentSetting.objects.filter(name="XNAME")
+        .order_by("id")
+        .values_list("value", flat=True)
+    ) == ["b", "c"]
+
+    with gzip.open(archive, "rt") as fh:
+        archived = [json.loads(line) for line in fh]
+    assert {row["id"] for row in archived if row["name"] == "XNAME"} == {
+        records[0].id,
+        records[1].id,
+    }
+
+
+def test_history_compact_command_dry_run_same_as_run():
+    from io import StringIO
+    from django.core.management import call_command
+
+    records = create_history("XNAME", ["a", "a", "b", "b"])
+
+    out = StringIO()
+    call_command(
+        "content_settings_history_compact", "--max-count", "2", "--dry-run", stdout=out
+    )
+    assert out.getvalue().strip() == (
+        "1 duplicated records and 1 records out of retention would be removed"
+    )
+
+    out = StringIO()
+    call_command("content_settings_history_compact", "--max-count", "2", stdout=out)
+    assert out.getvalue().strip() == (
+        "1 duplicated records and 1 records out of retention are removed"
+    )
+
+    assert list(
+        HistoryContentSetting.objects.filter(name="XNAME")
+        .order_by("id")
+        .values_list("id", flat=True)
+    ) == [records[2].id, records[3].id]
+
+
+@pytest.mark.parametrize("supports_over_clause", [True, False])
+def test_prefetch_previous(supports_over_clause, django_assert_num_queries):
+    from django.db import connection
+
+    records = create_history("XNAME", ["a", "b"]) + create_history("YNAME", ["c"])
+
+    with patch.object(
+        connection.features, "supports_over_clause", supports_over_clause
+    ):
+        with django_assert_num_queries(3):
+            prefetched = HistoryContentSetting.prefetch_previous(
+                HistoryContentSetting.objects.filter(id__in=[r.id for r in records])
+            )
+            assert {obj.id: obj.previous and obj.previous.id for obj in prefetched} == {
+                records[0].id: None,
+                records[1].id: records[0].id,
+                records[2].id: None,
+            }
+
+
+def test_admin_history_list_previous_value(webtest_admin):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def list_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            resp = webtest_admin.get("/admin/content_settings/historycontentsetting/")
+        assert resp.status_int == 200
+        return resp, len(ctx.captured_queries)
+
+    create_history("XNAME", ["first value", "second value"])
+    list_queries()
+    resp, queries = list_queries()
+    assert "first value" in resp.text
+
+    create_history("YNAME", ["a", "b", "c", "d"])
+    resp, more_queries = list_queries()
+    assert more_queries == queries
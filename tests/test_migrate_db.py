@@ -85,3 +85,102 @@ def test_overwrite_user_defined_not_allowed():
 
     with pytest.raises(AssertionError):
         set_initial_values_for_db(apply=True)
+
+
+def test_import_settings_bulk(django_assert_max_num_queries, testadmin):
+    from unittest.mock import patch
+    from content_settings.migrate import import_settings
+    from content_settings.models import HistoryContentSetting
+
+    data = {
+        "settings": {
+            "TITLE": {"value": "New Book Store"},
+            "DESCRIPTION": {"value": "New Description"},
+            "PREFIX": {"value": "prefix", "user_defined_type": "line"},
+        }
+    }
+    history_count = HistoryContentSetting.objects.count()
+
+    with patch("content_settings.receivers.recalc_checksums") as mock_recalc:
+        with django_assert_max_num_queries(9):
+            import_settings(
+                data,
+                model_cs=ContentSetting,
+                model_cs_history=HistoryContentSetting,
+                user=testadmin,
+            )
+        assert mock_recalc.call_count == 1
+
+    assert ContentSetting.objects.get(name="TITLE").value == "New Book Store"
+    assert ContentSetting.objects.get(name="PREFIX").value == "prefix"
+    assert HistoryContentSetting.objects.count() == history_count + 3
+
+    history = HistoryContentSetting.objects.filter(name="TITLE").first()
+    assert history.value == "New Book Store"
+    assert history.was_changed
+    assert history.user == testadmin
+
+    history = HistoryContentSetting.objects.filter(name="PREFIX").first()
+    assert history.was_changed is False
+    assert history.by_user
+
+
+def test_import_settings_bulk_delete():
+    from content_settings.migrate import import_settings
+    from content_settings.models import HistoryContentSetting
+
+    ContentSetting.objects.create(
+        name="PREFIX", value="prefix", user_defined_type="line"
+    )
+
+    import_settings(
+        {"settings": {"PREFIX": None}},
+        model_cs=ContentSetting,
+        model_cs_history=HistoryContentSetting,
+    )
+
+    assert not ContentSetting.objects.filter(name="PREFIX").exists()
+    history = HistoryContentSetting.objects.filter(name="PREFIX").first()
+    assert history.was_changed is None
+    assert history.by_user is False
+
+
+def test_bulk_sync_queries_do_not_depend_on_number_of_changes():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from content_settings.models import HistoryContentSetting
+
+    def sync_queries(names):
+        ContentSetting.objects.filter(name__in=names).delete()
+        with CaptureQueriesContext(connection) as ctx:
+            assert set_initial_values_for_db(apply=True) == [
+                (name, "create") for name in names
+            ]
+        return len(ctx.captured_queries)
+
+    # writes of the tag index depend only on whether settings have tags
+    title_has_tags = bool(ContentSetting.objects.get(name="TITLE").tags)
+    names = [
+        cs.name
+        for cs in ContentSetting.objects.exclude(name="TITLE").order_by("name")
+        if bool(cs.tags) == title_has_tags
+    ][:3]
+    history = HistoryContentSetting.objects.filter(
+        name__in=names, was_changed=False, by_user=False
+    )
+    history_count = history.count()
+
+    assert sync_queries(["TITLE"]) == sync_queries(sorted(names))
+    assert history.count() == history_count + len(names)
+
+
+def test_save_many_without_source():
+    from content_settings.caching import STORAGE
+    from content_settings.models import HistoryContentSetting
+
+    STORAGE.save_many({"TITLE": {"value": "New Title"}})
+
+    history = HistoryContentSetting.objects.filter(name="TITLE").first()
+    assert history.value == "New Title"
+    assert history.by_user is None
+    assert history.user is None
@@ -0,0 +1,230 @@
+import json
+import pytest
+from unittest.mock import patch
+
+from content_settings.storages import (
+    DBStorage,
+    MemoryStorage,
+    FileStorage,
+    StoredSetting,
+)
+from content_settings.caching import get_value, set_new_db_value, populate
+from content_settings.conf import set_initial_values_for_db, ALL
+
+from . import yaml_installed
+
+DATA = {
+    "settings": {
+        "TITLE": {"value": "The Book Store", "version": ""},
+        "WEE": {
+            "value": "12",
+            "tags": "one\ntwo",
+            "help": "12",
+            "version": "",
+            "user_defined_type": "text",
+        },
+    }
+}
+
+
+def test_memory_storage_load():
+    storage = MemoryStorage(data=DATA)
+
+    records = storage.load_all()
+    assert set(records) == {"TITLE", "WEE"}
+    assert records["TITLE"].value == "The Book Store"
+    assert records["WEE"].tags_set == {"one", "two"}
+    assert set(storage.load(["WEE", "UNKNOWN"])) == {"WEE"}
+
+
+def test_memory_storage_save_many():
+    storage = MemoryStorage(data=DATA)
+    revision = storage.revision()
+
+    with patch("content_settings.caching.recalc_checksums") as mock_recalc:
+        saved = storage.save_many({"TITLE": {"value": "New"}, "WEE": None})
+
+    assert mock_recalc.call_count == 1
+    assert saved["TITLE"].value == "New"
+    assert saved["TITLE"].version == ""
+    assert set(storage.load_all()) == {"TITLE"}
+    assert storage.revision() != revision
+    assert storage.load_changed_since(revision) == {
+        "TITLE": storage.load_all()["TITLE"],
+        "WEE": None,
+    }
+    assert storage.load_changed_since(storage.revision()) == {}
+
+
+def test_memory_storage_unknown_revision():
+    storage = MemoryStorage(data=DATA)
+    assert storage.load_changed_since("100") is None
+    assert storage.load_changed_since("abc") is None
+
+
+def test_file_storage_json(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps(DATA))
+
+    storage = FileStorage(path=str(path))
+    assert storage.is_available()
+    assert storage.load_all()["TITLE"].value == "The Book Store"
+
+    with patch("content_settings.caching.recalc_checksums"):
+        storage.save_many({"TITLE": {"value": "New"}})
+
+    data = json.loads(path.read_text())
+    assert data["settings"]["TITLE"]["value"] == "New"
+    assert "user_defined_type" not in data["settings"]["TITLE"]
+    assert data["settings"]["WEE"]["user_defined_type"] == "text"
+    assert FileStorage(path=str(path)).load_all()["TITLE"].value == "New"
+
+
+@pytest.mark.skipif(not yaml_installed, reason="yaml is not installed")
+def test_file_storage_yaml(tmp_path):
+    import yaml
+
+    path = tmp_path / "settings.yaml"
+    path.write_text(yaml.safe_dump(DATA))
+
+    storage = FileStorage(path=str(path))
+    assert storage.format == "yaml"
+    assert storage.load_all()["WEE"].help == "12"
+
+
+def test_file_storage_missing_file(tmp_path):
+    storage = FileStorage(path=str(tmp_path / "missing.json"))
+    assert not storage.is_available()
+    assert storage.load_all() == {}
+
+
+def test_stored_setting_to_dict():
+    assert StoredSetting(name="TITLE", value="1", version="").to_dict() == {
+        "value": "1",
+        "version": "",
+        "tags": None,
+        "help": None,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_storage():
+    storage = DBStorage()
+    assert storage.is_available()
+    assert storage.load(["TITLE"])["TITLE"].value == "Book Store"
+
+    storage.save_many({"TITLE": {"value": "New"}})
+    assert storage.load_all()["TITLE"].value == "New"
+
+
+def test_populate_from_memory_storage():
+    storage = MemoryStorage(data={"settings": {"TITLE": {"value": "Memory Title"}}})
+    with patch("content_settings.caching.STORAGE", storage):
+        populate()
+        assert get_value("TITLE") == "Memory Title"
+
+
+def test_populate_does_not_hide_storage_errors():
+    storage = MemoryStorage()
+    with patch("content_settings.caching.STORAGE", storage), patch.object(
+        storage, "load_all", side_effect=ValueError("broken storage")
+    ):
+        with pytest.raises(ValueError):
+            populate()
+
+
+@pytest.mark.django_db
+def test_db_storage_is_not_available_without_table():
+    from django.db import OperationalError
+
+    storage = DBStorage()
+    with patch.object(
+        DBStorage, "get_queryset", side_effect=OperationalError("no such table")
+    ):
+        assert not storage.is_available()
+
+    assert storage.is_available()
+
+
+def test_set_new_db_value_memory_storage():
+    storage = MemoryStorage()
+    with patch("content_settings.caching.STORAGE", storage):
+        set_new_db_value("TITLE", "New Title")
+        assert storage.load_all()["TITLE"].value == "New Title"
+        assert storage.load_all()["TITLE"].version == ALL["TITLE"].version
+        assert get_value("TITLE") == "New Title"
+
+
+def test_set_initial_values_memory_storage():
+    storage = MemoryStorage()
+    with patch("content_settings.caching.STORAGE", storage):
+        changes = set_initial_values_for_db(apply=True)
+        assert ("TITLE", "create") in changes
+        assert storage.load_all()["TITLE"].value == "Book Store"
+        assert set_initial_values_for_db(apply=True) == []
+
+
+def test_db_storage_read_db():
+    storage = DBStorage()
+    assert storage.get_read_db() is None
+
+    with patch("content_settings.storages.READ_DB", "replica"):
+        assert storage.get_read_db() == "replica"
+
+        storage.written()
+        assert storage.get_read_db() is None
+
+        with patch("content_settings.storages.READ_DB_STICKY_TIMEOUT", 0):
+            assert storage.get_read_db() == "replica"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_storage_save_reads_from_primary():
+    storage = DBStorage()
+    with patch("content_settings.storages.READ_DB", "replica"):
+        storage.save_many({"TITLE": {"value": "New"}})
+        assert storage.load_all()["TITLE"].value == "New"
+
+
+@pytest.mark.parametrize("ext", ["py", "marshal"])
+def test_frozen_storage(tmp_path, ext):
+    from content_settings.storages import dump_frozen, FrozenStorage
+
+    path = str(tmp_path / f"frozen.{ext}")
+    checksum = dump_frozen(DATA, path)
+
+    storage = FrozenStorage(source=path)
+    assert storage.revision() == checksum
+    assert storage.load_all()["WEE"].tags_set == {"one", "two"}
+    assert set(storage.load(["TITLE", "UNKNOWN"])) == {"TITLE"}
+
+    with pytest.raises(AssertionError):
+        storage.save_many({"TITLE": {"value": "New"}})
+
+
+def test_frozen_storage_wrong_checksum(tmp_path):
+    from content_settings.storages import FrozenStorage
+
+    path = tmp_path / "frozen.py"
+    path.write_text("CHECKSUM = 'wrong'\nSETTINGS = {}\n")
+
+    with pytest.raises(AssertionError):
+        FrozenStorage(source=str(path)).load_all()
+
+
+def test_populate_from_frozen_storage(tmp_path):
+    from content_settings.storages import dump_frozen, FrozenStorage
+    from content_settings.cache_triggers import FrozenTrigger
+    from content_settings.caching import check_update, get_form_checksum
+
+    path = str(tmp_path / "frozen.marshal")
+    checksum = dump_frozen(
+        {"settings": {"TITLE": {"value": "Frozen Title", "version": ""}}}, path
+    )
+
+    with patch("content_settings.caching.STORAGE", FrozenStorage(source=path)):
+        with patch("content_settings.caching.TRIGGER", FrozenTrigger()):
+            assert get_value("TITLE") == "Frozen Title"
+            assert get_form_checksum() == checksum
+            check_update()
+            assert get_value("TITLE") == "Frozen Title"
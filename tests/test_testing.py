@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+from content_settings.conf import content_settings
+from content_settings.context_managers import content_settings_context
+from content_settings.testing import (
+    content_settings_memory_storage,
+    content_settings_storage,
+)
+
+
+def test_default_value_without_db(content_settings_storage):
+    assert content_settings.TITLE == "Book Store"
+
+
+def test_context_without_db(content_settings_storage):
+    with content_settings_context(TITLE="New Title"):
+        assert content_settings.TITLE == "New Title"
+    assert content_settings.TITLE == "Book Store"
+
+
+def test_set_value_without_db(content_settings_storage):
+    content_settings.TITLE = "New Title"
+    assert content_settings.TITLE == "New Title"
+    assert content_settings_storage.load(["TITLE"])["TITLE"].value == "New Title"
+
+
+def test_value_is_restored_after_test(content_settings_storage):
+    assert content_settings.TITLE == "Book Store"
+    assert content_settings_storage.load(["TITLE"])["TITLE"].value == "Book Store"
+
+
+def test_snapshot_restore(content_settings_memory_storage):
+    storage = content_settings_memory_storage
+    snapshot = storage.snapshot()
+    revision = storage.revision()
+
+    with patch("content_settings.caching.recalc_checksums"):
+        storage.save_many({"TITLE": None})
+    assert "TITLE" not in storage.load_all()
+
+    storage.restore(snapshot)
+
+    assert storage.load_all()["TITLE"].value == "Book Store"
+    assert storage.load_changed_since(revision) is None
@@ -161,3 +161,15 @@ def test_empty_value(cs_type):
 def test_empty_value_list(cs_type):
     var = cs_type()
     assert var.give_python("") == []
+
+
+def test_simple_list_freeze():
+    var = SimpleStringsList(freeze=True)
+
+    assert var.give_python("a\nb") == ("a", "b")
+
+
+def test_typed_list_freeze():
+    var = SimpleIntsList(freeze=True)
+
+    assert var.to_python("1\n2") == (1, 2)
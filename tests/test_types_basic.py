@@ -291,3 +291,44 @@ def test_simple_html_template_tag():
         resp.content
         == b"SIMPLE_HTML_FIELD: <h1>Simple HTML</h1>\n\nTITLE: &lt;h1&gt;Simple HTML&lt;/h1&gt;"
     )
+
+
+def test_to_python_memo():
+    from unittest.mock import patch
+    from content_settings.memo import ToPythonMemo
+
+    memo = ToPythonMemo(size=2)
+    var = SimpleInt(to_python_memo=True)
+    other = SimpleInt(to_python_memo=True, version="2")
+
+    with patch("content_settings.memo.MEMO", memo):
+        with patch.object(SimpleInt, "to_python", wraps=var.to_python) as to_python:
+            assert var.give_python("10") == 10
+            assert var.give_python("10") == 10
+            assert to_python.call_count == 1
+
+            assert other.give_python("10") == 10
+            assert to_python.call_count == 2
+
+            assert var.give_python("20") == 20
+            assert var.give_python("10") == 10
+            assert to_python.call_count == 4
+
+    assert memo.stats() == {
+        "hits": 1,
+        "misses": 4,
+        "hit_rate": 0.2,
+        "size": 2,
+        "max_size": 2,
+    }
+
+
+def test_to_python_memo_not_used_by_default():
+    from unittest.mock import patch
+    from content_settings.memo import ToPythonMemo
+
+    memo = ToPythonMemo(size=2)
+    with patch("content_settings.memo.MEMO", memo):
+        assert SimpleInt().give_python("10") == 10
+
+    assert memo.stats()["misses"] == 0
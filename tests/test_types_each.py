@@ -89,6 +89,18 @@ class EachJSON(EachMixin, SimpleJSON):
             [{"book": Decimal("30"), "cover": Decimal("0.5")}],
             id="simple_item_values_decimal",
         ),
+        pytest.param(
+            EachJSON(each=Keys(price=SimpleDecimal()), freeze=True),
+            '{"name": "Book", "price": "1.5"}',
+            {"name": "Book", "price": Decimal("1.5")},
+            id="freeze_keys_decimal",
+        ),
+        pytest.param(
+            EachJSON(each=Values(SimpleDecimal()), freeze=True),
+            '{"price": "1.5"}',
+            {"price": Decimal("1.5")},
+            id="freeze_values_decimal",
+        ),
     ],
 )
 def test_validate_give(var, value, expected):
@@ -117,6 +129,18 @@ def test_validate_give(var, value, expected):
             "item #1: Missing required key price",
             id="item_missing_required",
         ),
+        pytest.param(
+            EachJSON(each=Keys(price=SimpleDecimal()), freeze=True),
+            '{"name": "Book", "price": "Zero"}',
+            "key price: Enter a number.",
+            id="freeze_key_price",
+        ),
+        pytest.param(
+            EachJSON(each=Item(Keys(price=SimpleDecimal(required))), freeze=True),
+            '[{"name": "Book"}]',
+            "item #1: Missing required key price",
+            id="freeze_item_missing_required",
+        ),
     ],
 )
 def test_each_validate(var, value, expected):
@@ -125,6 +149,16 @@ def test_each_validate(var, value, expected):
     assert e.value.message == expected
 
 
+def test_each_freeze():
+    from types import MappingProxyType
+
+    var = EachJSON(each=Item(Keys(price=SimpleDecimal())), freeze=True)
+    value = var.to_python('[{"name": "Book", "price": "1.5"}]')
+    assert isinstance(value, tuple)
+    assert isinstance(value[0], MappingProxyType)
+    assert value[0]["price"] == Decimal("1.5")
+
+
 @pytest.mark.skipif(not yaml_installed, reason="yaml is installed")
 def test_preview_admin_html():
     var = mix(EachMixin, SimpleYAML)(
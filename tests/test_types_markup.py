@@ -355,3 +355,26 @@ def test_lazy_attribute_suffix():
         "The Poplar",
         "The Night of Taras",
     ]
+
+
+def test_simple_json_freeze():
+    from types import MappingProxyType
+
+    var = SimpleJSON(freeze=True)
+    value = var.give_python('{"a": [1, {"b": 2}]}')
+
+    assert isinstance(value, MappingProxyType)
+    assert value["a"] == (1, {"b": 2})
+    assert isinstance(value["a"][1], MappingProxyType)
+
+    with pytest.raises(TypeError):
+        value["c"] = 3
+
+    assert var.json_view_value(value) == '{"a": [1, {"b": 2}]}'
+
+
+@pytest.mark.skipif(not yaml_installed, reason="yaml is not installed")
+def test_simple_yaml_freeze():
+    var = SimpleYAML(freeze=True)
+
+    assert var.give_python("- a\n- b") == ("a", "b")
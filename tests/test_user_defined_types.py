@@ -294,3 +294,95 @@ def test_fetch_startswith():
 
     resp = client.get("/books/fetch/is/")
     assert resp.json() == {"IS_CLOSED": False, "IS_EXISITNG": "Some Title Prefix"}
+
+
+@pytest.fixture
+def lazy_load():
+    from unittest.mock import patch
+
+    with patch("content_settings.caching.USER_DEFINED_LAZY_LOAD", 2):
+        yield
+
+
+def test_lazy_load_on_access(lazy_load, django_assert_num_queries):
+    from content_settings.conf import content_settings
+    from content_settings.caching import get_all_names, populate
+
+    for name in ("PREFIX", "SUFFIX", "MIDDLE"):
+        create_content_settings(name=name, value=name.lower(), user_defined_type="line")
+
+    populate()
+    assert "PREFIX" not in get_all_names()
+
+    with django_assert_num_queries(1):
+        assert content_settings.PREFIX == "prefix"
+
+    with django_assert_num_queries(0):
+        assert content_settings.PREFIX == "prefix"
+
+
+def test_lazy_load_evicts_least_recently_used(lazy_load):
+    from content_settings.conf import content_settings
+    from content_settings.caching import get_all_names
+
+    for name in ("PREFIX", "SUFFIX", "MIDDLE"):
+        create_content_settings(name=name, value=name.lower(), user_defined_type="line")
+
+    assert content_settings.PREFIX == "prefix"
+    assert content_settings.SUFFIX == "suffix"
+    assert content_settings.PREFIX == "prefix"
+    assert content_settings.MIDDLE == "middle"
+
+    names = get_all_names()
+    assert "PREFIX" in names
+    assert "MIDDLE" in names
+    assert "SUFFIX" not in names
+
+    assert content_settings.SUFFIX == "suffix"
+
+
+def test_lazy_load_evicts_created_in_process(lazy_load):
+    from content_settings.conf import content_settings
+    from content_settings.caching import DATA, set_new_db_value
+
+    for name in ("PREFIX", "SUFFIX", "MIDDLE"):
+        set_new_db_value(name, name.lower(), "line")
+
+    assert list(DATA.LAZY_NAMES) == ["SUFFIX", "MIDDLE"]
+    assert set(DATA.ALL_USER_DEFINES) == {"SUFFIX", "MIDDLE"}
+
+    assert content_settings.PREFIX == "prefix"
+    assert set(DATA.ALL_USER_DEFINES) == {"MIDDLE", "PREFIX"}
+
+
+def test_lazy_load_batch(django_assert_num_queries):
+    from unittest.mock import patch
+    from content_settings.conf import content_settings
+    from content_settings.caching import load_user_defined, populate, get_all_names
+
+    for name in ("PREFIX", "SUFFIX"):
+        create_content_settings(name=name, value=name.lower(), user_defined_type="line")
+
+    with patch("content_settings.caching.USER_DEFINED_LAZY_LOAD", 10):
+        populate()
+        assert "PREFIX" not in get_all_names()
+
+        with django_assert_num_queries(1):
+            load_user_defined(["PREFIX", "SUFFIX", "UNKNOWN"])
+            assert content_settings.PREFIX == "prefix"
+            assert content_settings.SUFFIX == "suffix"
+            assert "UNKNOWN" not in content_settings
+
+
+def test_lazy_load_updated_by_checksum(lazy_load):
+    from content_settings.conf import content_settings
+
+    cs = create_content_settings(
+        name="PREFIX", value="prefix", user_defined_type="line"
+    )
+    assert content_settings.PREFIX == "prefix"
+
+    cs.value = "new prefix"
+    cs.save()
+    check_update()
+    assert content_settings.PREFIX == "new prefix"